@@ -71,6 +71,7 @@ def add_potcar_family(path):
     import warnings
 
     from tabulate import tabulate
+    from aiida.manage import get_manager
 
     from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
     from aiida_cusp.utils.defaults import VaspDefaults
@@ -140,8 +141,10 @@ def add_potcar_family(path):
     # ask for confirmation before the actual storing is performed
     if click.confirm("Before continuing, please check the displayed list "
                      "for possible errors! Continue and store?"):
-        for potcar_file_node in potentials_to_store:
-            stored_node = potcar_file_node.store()
+        # store all potentials within a single database transaction
+        with get_manager().get_profile_storage().transaction():
+            stored_nodes = [node.store() for node in potentials_to_store]
+        for stored_node in stored_nodes:
             click.echo("Created new VaspPotcarFile node with UUID {} at ID {}"
                        .format(stored_node.uuid, stored_node.id))
     else:
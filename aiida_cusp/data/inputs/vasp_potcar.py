@@ -8,6 +8,9 @@ pseudo-potential files
 
 
 import re
+import functools
+
+from uuid import UUID
 
 from pymatgen.core import Structure, periodic_table
 from pymatgen.io.vasp.inputs import Poscar, Potcar, PotcarSingle
@@ -57,6 +60,10 @@ class VaspPotcarFile(SinglefileData):
     :param checksum: SHA-256 hash of the potential contents
     :type checksum: str
     """
+
+    # regex for matching the element at the beginning of the potential name
+    _RE_NAME_ELEMENT = re.compile(r"^[A-Z]{1}[a-z]{0,1}")
+
     def __init__(self, path_to_potcar, name, element, version, functional,
                  checksum):
         # initialize the bare SinglefileData node
@@ -144,17 +151,25 @@ class VaspPotcarFile(SinglefileData):
         potcar_functional = potcar_attrs.functional
         potcar_version = potcar_attrs.version
         potcar_hash = potcar_attrs.hash
-        potentials_with_tags = cls.from_tags(name=potcar_name,
-                                             version=potcar_version,
-                                             functional=potcar_functional)
-        if len(potentials_with_tags) == 0:
+        # only project the pk and hash of the first match instead of loading
+        # all matching nodes
+        filters = {
+            'attributes.name': {'==': potcar_name},
+            'attributes.version': {'==': potcar_version},
+            'attributes.functional': {'==': potcar_functional},
+        }
+        query = QueryBuilder()
+        query.append(cls, filters=filters, subclassing=False,
+                     project=['id', 'attributes.hash'])
+        first_match = query.first()
+        if first_match is None:
             return True  # potential is unique
         else:
-            first_match = potentials_with_tags[0]
-            if first_match.hash == potcar_hash:  # it's the very same potential
+            first_match_pk, first_match_hash = first_match
+            if first_match_hash == potcar_hash:  # it's the very same potential
                 err_msg = ("Identical potential (same identifiers and "
                            "identical hash value) is already present in the "
-                           "database at PK: {}".format(first_match.pk))
+                           "database at PK: {}".format(first_match_pk))
             else:  # same identifiers but different contents?
                 err_msg = ("Potential with matching identifiers ({}, {}, {}) "
                            "but different hash value is already present in "
@@ -165,7 +180,7 @@ class VaspPotcarFile(SinglefileData):
                            "change the potential identifiers in order to "
                            "store the potential)"
                            .format(potcar_name, potcar_version,
-                                   potcar_functional, first_match.pk))
+                                   potcar_functional, first_match_pk))
             raise MultiplePotcarError(err_msg)
 
     @classmethod
@@ -210,15 +225,18 @@ class VaspPotcarFile(SinglefileData):
             filters.update({'attributes.hash': {'==': checksum}})
         if functional is not None:
             filters.update({'attributes.functional': {'==': functional}})
-        # setup query for VaspPotcarFile objects with generated filter list
-        if filters:
-            database_potential_query = QueryBuilder()
-            database_potential_query.append(cls, filters=filters)
-        else:
+        if not filters:
             raise VaspPotcarFileError("Database query for potcar file nodes "
                                       "failed because not tags were given")
+        # setup query for VaspPotcarFile objects with generated filter list
+        # (disable subclassing to query for the exact node type instead of
+        # matching the type string's prefix)
+        database_potential_query = QueryBuilder()
+        database_potential_query.append(cls, filters=filters,
+                                        subclassing=False)
+        potentials = [_ for [_] in database_potential_query.all()]
         # return results obtained by the query builder
-        return [_ for [_] in database_potential_query.all()]
+        return potentials
 
     def _validate(self):
         """Validate the stored potential identifiers."""
@@ -239,7 +257,7 @@ class VaspPotcarFile(SinglefileData):
 
     def validate_name(self, name):
         """Assert potential name starts with valid element name."""
-        match_name = re.match(r"^[A-Z]{1}[a-z]{0,1}", name)
+        match_name = self._RE_NAME_ELEMENT.match(name)
         if match_name is None:
             raise VaspPotcarFileError("Unable to parse the element from given "
                                       "potential name '{}'".format(name))
@@ -280,6 +298,10 @@ class VaspPotcarData(Dict):
     potential's uuid value and the unique potential identifiers (name,
     functional, version and the content hash)
     """
+
+    # regex for matching the element at the beginning of the potential name
+    _RE_NAME_ELEMENT = re.compile(r"^([A-Z]{1}[a-z]*)(?=[^A-Za-z]*)")
+
     def __init__(self, *args, **kwargs):
         name = kwargs.pop('name', None)
         version = kwargs.pop('version', None)
@@ -391,26 +413,16 @@ class VaspPotcarData(Dict):
             a list of potential names to be used for the calculation
         :type potcar_params: `dict` or `list`
         """  # noqa: W605
-        # get pymatgen structure object
-        if isinstance(structure, Structure):
-            struct = structure
-        elif isinstance(structure, StructureData):
-            struct = structure.get_pymatgen_structure()
-        elif isinstance(structure, Poscar):
-            struct = structure.structure
-        elif isinstance(structure, VaspPoscarData):
-            struct = structure.get_poscar().structure
-        else:
-            raise VaspPotcarDataError("Unsupported structure type '{}'"
-                                      .format(type(structure)))
+        site_symbols = cls.site_symbols_from_structure(structure)
         # transform list of potential names to valid potential params
         # dictionary
         if isinstance(potcar_params, (list, tuple)):
             potcar_params = cls.potcar_props_from_name_list(potcar_params)
         # build list of species comprising the structure and create default
-        # potential properties based on the species list (use a set because
-        # of possibly non-ordered input structures)
-        symbols = list(set([str(element) for element in struct.species]))
+        # potential properties based on the species list (remove duplicates
+        # of possibly non-ordered input structures while keeping the order
+        # of first occurrence)
+        symbols = list(dict.fromkeys(site_symbols))
         potcar_props_defaults = {
             symbol: {'name': symbol, 'version': None} for symbol in symbols
         }
@@ -432,17 +444,68 @@ class VaspPotcarData(Dict):
             element_potential_map.update({element: cls(**identifiers)})
         return element_potential_map
 
+    @classmethod
+    def site_symbols_from_structure(cls, structure):
+        """
+        Return the element symbols of all sites in the given structure.
+
+        Symbols are read directly from the passed structure data, i.e.
+        without converting :class:`~aiida.orm.StructureData` and
+        :class:`~aiida_cusp.data.inputs.vasp_poscar.VaspPoscarData` inputs
+        to a pymatgen structure first. For all structure types only the
+        element symbol is returned, i.e. possibly defined oxidation states
+        are ignored (`'Fe'` instead of `'Fe2+'`).
+
+        :param structure: input structure
+        :type structure: :class:`~pymatgen.core.structure.Structure`,
+            :class:`~pymatgen.io.vasp.inputs.Poscar`,
+            :class:`~aiida.orm.nodes.data.structure.StructureData` or
+            :class:`~aiida_cusp.data.inputs.vasp_poscar.VaspPoscarData`
+        :return: list of element symbols for all sites in the structure
+        :rtype: list(str)
+        :raises VaspPotcarDataError: if the structure type is not supported
+        """
+        if isinstance(structure, Structure):
+            return [specie.symbol for specie in structure.species]
+        elif isinstance(structure, Poscar):
+            return [specie.symbol for specie in structure.structure.species]
+        elif isinstance(structure, StructureData):
+            kinds = {kind.name: kind.symbol for kind in structure.kinds}
+            return [kinds[site.kind_name] for site in structure.sites]
+        elif isinstance(structure, VaspPoscarData):
+            sites = structure.get_dict()['structure']['sites']
+            # fall back to the pymatgen structure for disordered sites
+            if any(len(site['species']) != 1 for site in sites):
+                species = structure.get_poscar().structure.species
+                return [specie.symbol for specie in species]
+            return [site['species'][0]['element'] for site in sites]
+        else:
+            raise VaspPotcarDataError("Unsupported structure type '{}'"
+                                      .format(type(structure)))
+
     @classmethod
     def potcar_props_from_name_list(cls, potcar_name_list):
         """
         Create a valid potcar properties dictionary from a list of given
         potential names
         """
+        potcar_props = cls._potcar_props_from_names(tuple(potcar_name_list))
+        # return a copy to protect the cached results from modifications
+        return {element: dict(props) for element, props in
+                potcar_props.items()}
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _potcar_props_from_names(potcar_name_list):
+        """
+        Cached implementation of potcar_props_from_name_list() (requires
+        hashable input, i.e. a tuple of potential names)
+        """
         valid_elements = [e.name for e in periodic_table.Element]
-        element_regex = r"^([A-Z]{1}[a-z]*)(?=[^A-Za-z]*)"
+        element_regex = VaspPotcarData._RE_NAME_ELEMENT
         elements, names = [], []
         for potential_name in potcar_name_list:
-            element_match = re.match(element_regex, potential_name)
+            element_match = element_regex.match(potential_name)
             if element_match is None:
                 raise VaspPotcarDataError("Couldn't parse the element name "
                                           "for the passed potential name '{}'"
@@ -532,10 +595,10 @@ class VaspPotcarData(Dict):
         """
         Load the actual potential node associated with the potential data node
 
-        First tries to load the potential file node from the given UUID. If
-        this fails (for instance because the VaspPotcarData node was imported
-        from some other database) a second attempt will try to load a potential
-        file node based on the stored content hash.
+        Loads the potential file node with the given UUID. If no such node
+        exists (for instance because the VaspPotcarData node was imported
+        from some other database) a potential file node with matching content
+        hash is loaded instead. (Both are queried within a single query)
 
         :returns: the associated VaspPotcarFile node
         :rtype: :class:`~aiida_cusp.data.inputs.vasp_potcar.VaspPotcarFile`
@@ -543,18 +606,31 @@ class VaspPotcarData(Dict):
             is found in the database
         """
         contents = self.get_dict()
+        uuid = contents['filenode_uuid']
+        # query for matching uuid or hash at once and prefer the node with
+        # matching uuid (if present) over nodes with matching hash (only
+        # filter for valid uuids and non-empty hashes which would otherwise
+        # raise on the database side)
+        filters = {'or': []}
         try:
-            try:  # first attempt: try to load from uuid
-                uuid = contents['filenode_uuid']
-                loaded_file_node = load_node(uuid)
-            except NotExistent:  # second attemt: try to load from hash
-                chksum = contents['hash']
-                loaded_file_node = VaspPotcarFile.from_tags(checksum=chksum)[0]
-        except IndexError:
+            uuid = str(UUID(uuid))
+            filters['or'].append({'uuid': {'==': uuid}})
+        except (TypeError, ValueError):
+            pass
+        if contents['hash'] is not None:
+            filters['or'].append({'attributes.hash': {'==': contents['hash']}})
+        potentials = []
+        if filters['or']:
+            query = QueryBuilder()
+            query.append(VaspPotcarFile, filters=filters, subclassing=False)
+            potentials = [_ for [_] in query.all()]
+        if not potentials:
             raise VaspPotcarDataError("Unable to discover associated "
                                       "potential file node in the database "
                                       "(tried UUID and HASH). Check if "
                                       "potential is available!")
+        loaded_file_node = next((p for p in potentials if p.uuid == uuid),
+                                potentials[0])
         # sanity check if the loaded potential really matches
         assert loaded_file_node.name == contents['name']
         assert loaded_file_node.version == contents['version']
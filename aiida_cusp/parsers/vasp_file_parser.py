@@ -7,8 +7,11 @@ of AiiDA managed VASP calculations
 """
 
 
+import os
 import re
+import fnmatch
 import pathlib
+import functools
 from pymatgen.io.vasp.inputs import Poscar
 
 from aiida_cusp.parsers.parser_base import ParserBase
@@ -45,6 +48,21 @@ class VaspFileParser(ParserBase):
         are added.
     """
 
+    # regular expressions used to generate the output linknames
+    # subfolders of NEB calculations (i.e. 00 - 99)
+    _RE_NEB_FOLDER = re.compile(r"^[0-9]{2}$")
+    # characters not allowed in linknames
+    _RE_INVALID_CHARS = re.compile(r"[^a-z0-9_]")
+    # files which are never parsed, even if matched by the parse_files list
+    _NEVER_PARSED = frozenset([VaspDefaults.FNAMES['potcar']])
+    # translation table normalizing ascii-only filenames in a single pass
+    # (i.e. lowercase all letters and replace invalid chars by underscores)
+    _NORMALIZE_TABLE = str.maketrans({
+        chr(c): (chr(c).lower() if chr(c).isalnum() or chr(c) == "_"
+                 else "_")
+        for c in range(128)
+    })
+
     def parse(self, **kwargs):
         # check folders and set file list
         exit_code = super(VaspFileParser, self).parse(**kwargs)
@@ -77,7 +95,15 @@ class VaspFileParser(ParserBase):
         replace all non-alphanumeric characters with underscores, as such
         character are not allowed in output linknames
         """
-        return re.sub(r"[^a-z0-9_]", "_", filepath.name.lower())
+        return self._normalized_filename(filepath.name)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _normalized_filename(filename):
+        """Normalize the given filename (results are cached)"""
+        if filename.isascii():
+            return filename.translate(VaspFileParser._NORMALIZE_TABLE)
+        return VaspFileParser._RE_INVALID_CHARS.sub("_", filename.lower())
 
     def parsing_hook(self, filepath):
         return "parse_{}".format(self.normalized_filename(filepath))
@@ -87,13 +113,24 @@ class VaspFileParser(ParserBase):
         Generate the output linkname under which the file at the given
         location will be available
         """
-        neb_folder = re.match(r"^[0-9]{2}$", str(filepath.parent.name))
-        if neb_folder:
+        return self._linkname(filepath.parent.name, filepath.name)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _linkname(parent_name, filename):
+        """
+        Generate the linkname from the file's name and the name of its parent
+        folder (results are cached)
+        """
+        # only run the regex for folder names of matching length
+        if (len(parent_name) == 2
+                and VaspFileParser._RE_NEB_FOLDER.match(parent_name)):
             namespace = "{}{}.".format(PluginDefaults.NEB_NODE_PREFIX,
-                                       neb_folder.group())
+                                       parent_name)
         else:
             namespace = ""
-        return "{}{}".format(namespace, self.normalized_filename(filepath))
+        normalized = VaspFileParser._normalized_filename(filename)
+        return "{}{}".format(namespace, normalized)
 
     def build_parsing_list(self):
         """
@@ -102,16 +139,22 @@ class VaspFileParser(ParserBase):
         """
         path_to_tmpfolder = pathlib.Path(self.tmpfolder).absolute()
         self.files_to_parse = []
-        for name_or_wildcard in self.parsing_list:
-            filelist = list(path_to_tmpfolder.rglob(name_or_wildcard))
-            # only parse files and remove possibly matching folders but
-            # NEVER EVER parse a POTCAR file
-            self.files_to_parse += [
-                f for f in filelist if f.is_file()
-                and f.name != VaspDefaults.FNAMES['potcar']
-            ]
-        # do not parse the same file multiple times
-        self.files_to_parse = list(set(self.files_to_parse))
+        # walk the folder only once and match all names against the
+        # combined pattern (this also ensures that no file is added multiple
+        # times). directory entries returned by os.scandir() cache their
+        # type such that no additional stat() calls are required
+        folders = [str(path_to_tmpfolder)] if self.parsing_list else []
+        while folders:
+            with os.scandir(folders.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.path)
+                    # only parse files and remove possibly matching folders
+                    # but NEVER EVER parse a POTCAR file
+                    elif (entry.name not in self._NEVER_PARSED
+                          and self.is_listed(entry, path_to_tmpfolder)
+                          and entry.is_file()):
+                        self.files_to_parse.append(pathlib.Path(entry.path))
         if not self.files_to_parse and self.fail_on_empty_list:
             exit_code = self.exit_codes.ERRNO_PARSING_LIST_EMPTY
         else:
@@ -126,12 +169,76 @@ class VaspFileParser(ParserBase):
         parse_default = ['CONTCAR', 'vasprun.xml', 'OUTCAR']
         settings = dict(self.settings)
         self.fail_on_empty_list = settings.pop('fail_on_missing_files', False)
-        self.parsing_list = settings.pop('parse_files', parse_default)
+        self.parsing_list = self._reduce_parsing_list(
+            settings.pop('parse_files', parse_default))
+        # translate all given names and wildcards to a single regular
+        # expression matching any of them (or None if only path-qualified
+        # entries are given which are matched against the relative path)
+        names = [p for p in self.parsing_list if '/' not in p]
+        self.parsing_paths = [p for p in self.parsing_list if '/' in p]
+        if names:
+            self.parsing_regex = re.compile("|".join(
+                "(?:{})".format(fnmatch.translate(name_or_wildcard))
+                for name_or_wildcard in names
+            ))
+        else:
+            self.parsing_regex = None
         if settings:
             return self.exit_codes.ERRNO_UNKNOWN_PARSER_SETTING
         else:
             return None
 
+    def is_listed(self, entry, path_to_tmpfolder):
+        """
+        Check if the given directory entry is matched by any of the names or
+        wildcards on the parsing list
+
+        Path-qualified entries (i.e. '01/OUTCAR') are matched against the
+        entry's path relative to the retrieved folder (see `_match_path()`)
+        """
+        if self.parsing_regex and self.parsing_regex.match(entry.name):
+            return True
+        if self.parsing_paths:
+            relpath = os.path.relpath(entry.path, path_to_tmpfolder)
+            relpath = pathlib.PurePath(relpath).as_posix()
+            return any(self._match_path(relpath, name_or_wildcard)
+                       for name_or_wildcard in self.parsing_paths)
+        return False
+
+    @staticmethod
+    def _match_path(relpath, name_or_wildcard):
+        """
+        Check if the trailing components of the given relative path match
+        the components of the given name or wildcard (i.e. equivalent to
+        the matching done by `pathlib.Path.rglob()`)
+        """
+        path_parts = relpath.split('/')
+        pattern_parts = name_or_wildcard.split('/')
+        if len(pattern_parts) > len(path_parts):
+            return False
+        return all(fnmatch.fnmatchcase(part, pattern) for (part, pattern)
+                   in zip(path_parts[-len(pattern_parts):], pattern_parts))
+
+    @staticmethod
+    def _reduce_parsing_list(parsing_list):
+        """
+        Remove duplicate names and wildcards from the parsing list as well as
+        explicit filenames already covered by any of the given wildcards
+
+        Coverage is checked using the same rule used for matching the
+        retrieved files (see `_match_path()`), i.e. explicit filenames are
+        treated as paths relative to the retrieved folder
+        """
+        reduced = list(dict.fromkeys(parsing_list or []))
+        if '*' in reduced:
+            return ['*']
+        # only check for covered filenames on reasonably short lists
+        if len(reduced) <= 8:
+            wildcards = [p for p in reduced if any(c in p for c in '*?[')]
+            reduced = [p for p in reduced if p in wildcards or not any(
+                VaspFileParser._match_path(p, w) for w in wildcards)]
+        return reduced
+
     def parse_vasprun_xml(self, filepath):
         """
         Parsing hook triggered files of type vasprun.xml
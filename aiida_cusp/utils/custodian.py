@@ -202,29 +202,17 @@ class CustodianSettings(object):
             raise CustodianSettingsError("Unknown Custodian setting(s) '{}'"
                                          .format(unknown_settings))
 
-    def write_custodian_spec(self, path_to_file):
+    def custodian_spec_contents(self):
         """
-        Generate custodian specification yaml-file.
+        Generate the contents of the custodian specification yaml-file.
 
-        Before writing the file all settings and handler contents are properly
-        re-arranged such that the generated yaml-file is understood by the
-        custodian command-line executable.
+        All settings and handler contents are properly re-arranged such that
+        the generated yaml-file is understood by the custodian command-line
+        executable.
 
-        :param path_to_file:
-        :type path_to_file:
-        :raises CustodianSettingsError: if the file defined by the passed
-            `path_to_file` variable does not contain the .yaml suffix
-        :return: None
+        :return: contents of the custodian specification file
+        :rtype: `str`
         """
-        # perform initial file-check
-        expected_suffix = '.yaml'
-        if not path_to_file.suffix == expected_suffix:
-            raise CustodianSettingsError("Given path '{}' does not seem to "
-                                         "represent a valid yaml file (suffix "
-                                         "'{}' =/= '{}')"
-                                         .format(path_to_file,
-                                                 path_to_file.suffix,
-                                                 expected_suffix))
         # replace vasp_cmd with $vasp_cmd to properly expand given arguments
         # when spec file is read by custodian
         vasp_job_settings = dict(self.vaspjob_settings)
@@ -255,10 +243,33 @@ class CustodianSettings(object):
             'handlers': custodian_handlers,
             'custodian_params': custodian_settings,
         }
+        return yaml.dump(custodian_spec_contents, explicit_start=False,
+                         default_flow_style=False, allow_unicode=True)
+
+    def write_custodian_spec(self, path_to_file):
+        """
+        Generate custodian specification yaml-file.
+
+        Before writing the file all settings and handler contents are properly
+        re-arranged such that the generated yaml-file is understood by the
+        custodian command-line executable.
+
+        :param path_to_file:
+        :type path_to_file:
+        :raises CustodianSettingsError: if the file defined by the passed
+            `path_to_file` variable does not contain the .yaml suffix
+        :return: None
+        """
+        # perform initial file-check
+        expected_suffix = '.yaml'
+        if not path_to_file.suffix == expected_suffix:
+            raise CustodianSettingsError("Given path '{}' does not seem to "
+                                         "represent a valid yaml file (suffix "
+                                         "'{}' =/= '{}')"
+                                         .format(path_to_file,
+                                                 path_to_file.suffix,
+                                                 expected_suffix))
         # generate custodian input file
-        cstdn_spec_file_contents = yaml.dump(custodian_spec_contents,
-                                             explicit_start=False,
-                                             default_flow_style=False,
-                                             allow_unicode=True)
+        cstdn_spec_file_contents = self.custodian_spec_contents()
         with open(path_to_file.absolute(), 'w') as cstdn_spec_file:
             cstdn_spec_file.write(cstdn_spec_file_contents)
@@ -106,17 +106,20 @@ class PotcarParser(object):
     }
 
     # regular expressions used for parsing
-    # remove and codense to transform contents in well defined state
-    _RE_REMOVE_CHARS = re.compile(r"[\^]")  # replace with ""
-    _RE_CONDENSE_CHARS = re.compile(r"[ \t]+")  # replace with " "
-    # header
+    # consecutive whitespaces condensed to a single one (after removing '^'
+    # chars and replacing tabs)
+    _RE_CONDENSE_SPACES = re.compile(r" {2,}")
+    # header (and the markers enclosing it used for the header fast-path)
+    _HEADER_START = "PSCTR are:"
+    _HEADER_END = "END of PSCTR"
     _RE_HEADER = re.compile(r"(?i)(?<=psctr are\:)([\s\S]+)(?=end of psctr)")
-    # title
-    _RE_TITLE = re.compile(r"^([\s\S]*?)(?=\n)")
     # element
     _RE_ELEMENT = re.compile(r"(?i)(?<=VRHFIN)(?:\s*=\s*)([a-z]+)(?=\s*\:)")
     # creation date
     _RE_DATE = re.compile(r"(?i)([0-9]+[a-z]{3,}[0-9]+)")
+    # day / year and month contained in the parsed creation date
+    _RE_DATE_NUMBERS = re.compile(r"[0-9]+")
+    _RE_DATE_MONTH = re.compile(r"(?i)([a-z]+)")
 
     def __init__(self, path_to_potcar_file, name=None, functional=None):
         self.name = name
@@ -168,11 +171,25 @@ class PotcarParser(object):
         :rtype: str
         """
         raw_content = self.load_potential_contents()
-        reduced_content = raw_content
-        # remove all unwanted chars from the contents
-        reduced_content = self._RE_REMOVE_CHARS.sub(r"", reduced_content)
-        reduced_content = self._RE_CONDENSE_CHARS.sub(r" ", reduced_content)
-        return reduced_content
+        return self.reduce_contents(raw_content)
+
+    @staticmethod
+    def reduce_contents(content):
+        """
+        Remove all '^' chars from the given contents and condense consecutive
+        whitespaces and tabs to a single whitespace
+
+        Uses plain string replacements for the single chars and a single
+        regular expression substitution for the remaining runs of
+        whitespaces, i.e. only whitespaces and tabs are condensed.
+
+        :param content: the contents to be reduced
+        :type content: str
+        :return: the reduced contents
+        :rtype: str
+        """
+        content = content.replace("^", "").replace("\t", " ")
+        return PotcarParser._RE_CONDENSE_SPACES.sub(" ", content)
 
     def load_potential_contents(self):
         """
@@ -202,13 +219,13 @@ class PotcarParser(object):
         """
         Extract the potential title (i.e. the first line of the file)
         """
-        regex_match = self._RE_TITLE.match(self.contents)
-        if regex_match:
-            return regex_match.group(1)
+        # only locate the first line break instead of matching the contents
+        end = self.contents.find("\n")
+        if end >= 0:
+            return self.contents[:end]
         else:  # raise because we use the title only internally
             raise PotcarParserError("Error parsing title line for file '{}'."
-                                    "Match returned '{}'."
-                                    .format(self.path, regex_match))
+                                    "No line break found.".format(self.path))
 
     def potential_header(self):
         """
@@ -218,6 +235,13 @@ class PotcarParser(object):
         :rtype: str
         :raises PotcarParserError: if regex returns with no match
         """
+        # fast path: locate the header using the (case-sensitive) markers
+        # found in VASP potential files and only fall back to the more
+        # expensive regex if the markers are not found
+        start = self.contents.find(self._HEADER_START)
+        end = self.contents.rfind(self._HEADER_END)
+        if start >= 0 and end > start + len(self._HEADER_START):
+            return self.contents[start + len(self._HEADER_START):end]
         regex_match = self._RE_HEADER.search(self.contents)
         if regex_match:
             return regex_match.group(1)
@@ -249,8 +273,8 @@ class PotcarParser(object):
         if regex_match:
             datestr = regex_match.group(1)
             # assign content strings to numerical values
-            day, year = list(map(int, re.findall(r"[0-9]+", datestr)))
-            month_str = re.search(r"(?i)([a-z]+)", datestr).group(0)
+            day, year = list(map(int, self._RE_DATE_NUMBERS.findall(datestr)))
+            month_str = self._RE_DATE_MONTH.search(datestr).group(0)
             month = self._MONTH_TO_NUM_MAP[month_str.lower()]
             # build the version string of the form YYYYMMDD (possibly wrong
             # values due to format issues will be corrected later!)
@@ -305,6 +329,11 @@ class PotcarPathParser(object):
         if the path does not contain a valid archive name to identify the
         corresponding functional
     """
+
+    # regex for matching pseudopotential functional folder
+    _RE_FUNCTIONAL = re.compile(r"(?i)(pot(?:uspp|paw)\_(?:lda|pbe|gga)"
+                                r"(?:\.52|\.54)*)")
+
     def __init__(self, potcar_file_path):
         # first check if the given path is a file and if the file name is
         # POTCAR
@@ -342,9 +371,7 @@ class PotcarPathParser(object):
         :raises PotcarPathError: if no valid functional identifier can be
             found in the given path.
         """
-        # regex for matching pseudopotential functional folder
-        regex = r"(?i)(pot(?:uspp|paw)\_(?:lda|pbe|gga)(?:\.52|\.54)*)"
-        functional_match = re.search(regex, str(path))
+        functional_match = self._RE_FUNCTIONAL.search(str(path))
         if functional_match is None:
             raise PotcarPathError("Unable to parse functional identifier "
                                   "(i.e. potuspp_lda, potpaw_lda, "
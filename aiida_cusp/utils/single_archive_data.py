@@ -85,6 +85,27 @@ class SingleArchiveData(SinglefileData):
         else:
             return archive_contents
 
+    def iter_content(self, chunk_size=1 << 20, decompress=True):
+        """
+        Iterate over the archive (i.e. compressed) or the file (i.e. the
+        decompressed) contents stored in the node in chunks of bytes.
+
+        Contrary to :meth:`get_content` the stored contents are never loaded
+        into memory all at once.
+
+        :param chunk_size: maximum size of the returned chunks in bytes
+        :type chunk_size: `int`
+        :param decompress: Indicate wether comressed or uncompressed contents
+            are returned
+        :type decompress: `bool`
+        """
+        with self.open(mode='rb') as archive:
+            if decompress:
+                archive = gzip.GzipFile(fileobj=archive, mode='rb')
+            with archive:
+                for chunk in iter(lambda: archive.read(chunk_size), b''):
+                    yield chunk
+
     def write_file(self, filepath, decompress=True):
         """
         Write the node's contents to a file
@@ -100,7 +121,8 @@ class SingleArchiveData(SinglefileData):
         if filepath.is_dir():
             raise ValueError("invalid filename (not a file)")
         with open(filepath, 'wb') as outfile:
-            outfile.write(self.get_content(decompress=decompress))
+            for chunk in self.iter_content(decompress=decompress):
+                outfile.write(chunk)
 
     @property
     def filepath(self):
@@ -6,9 +6,8 @@ import pytest
 
 @pytest.mark.parametrize('valid_input', ['incar', 'kpoints', 'poscar',
                          'potcar', 'restart'])
-def test_input_port_availability(valid_input):
-    from aiida.plugins import CalculationFactory
-    inputs = CalculationFactory('cusp.vasp').get_builder()._valid_fields
+def test_input_port_availability(valid_input, vasp_calculation_class):
+    inputs = vasp_calculation_class.get_builder()._valid_fields
     assert valid_input in inputs
 
 
@@ -20,8 +19,7 @@ def test_input_port_availability(valid_input):
 @pytest.mark.filterwarnings("ignore::UserWarning")
 def test_missing_input_raises(incar, kpoints, poscar, with_pbe_potcars,
                               vasp_code, aiida_sandbox, use_incar, use_potcar,
-                              use_kpoints):
-    from aiida.plugins import CalculationFactory
+                              use_kpoints, vasp_calculation_class):
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -37,7 +35,7 @@ def test_missing_input_raises(incar, kpoints, poscar, with_pbe_potcars,
         inputs.update({'kpoints': kpoints})
     if use_potcar:
         inputs.update({'potcar': VaspPotcarData.from_structure(poscar, 'pbe')})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_calc = VaspCalculation(inputs=inputs)
     if all([use_incar, use_kpoints, use_potcar]):
         vasp_calc.prepare_for_submission(aiida_sandbox)
@@ -49,9 +47,9 @@ def test_missing_input_raises(incar, kpoints, poscar, with_pbe_potcars,
 
 @pytest.mark.filterwarnings("ignore::UserWarning")
 def test_vasp_calculation_setup(vasp_code, cstdn_code, incar, kpoints, poscar,
-                                with_pbe_potcars, aiida_sandbox):
+                                with_pbe_potcars, aiida_sandbox,
+                                vasp_calculation_class):
     import pathlib
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
     from aiida_cusp.utils.defaults import PluginDefaults
     # set the input plugin for code
@@ -68,7 +66,7 @@ def test_vasp_calculation_setup(vasp_code, cstdn_code, incar, kpoints, poscar,
         'potcar': potcar_linklist,
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspBasicCalculation = CalculationFactory('cusp.vasp')
+    VaspBasicCalculation = vasp_calculation_class
     vasp_calc = VaspBasicCalculation(inputs=inputs)
     vasp_calc.prepare_for_submission(aiida_sandbox)
     potcar = VaspPotcarData.potcar_from_linklist(poscar, potcar_linklist)
@@ -91,10 +89,9 @@ def test_vasp_calculation_setup(vasp_code, cstdn_code, incar, kpoints, poscar,
 
 @pytest.mark.parametrize('invalid_input', ['poscar', 'potcar'])
 def test_invalid_restart_inputs_raise(vasp_code, poscar, with_pbe_potcars,
-                                      invalid_input):
-    from aiida.plugins import CalculationFactory
+                                      invalid_input, vasp_calculation_class):
     from aiida_cusp.data import VaspPotcarData
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     inputs = {
         'code': vasp_code,
         'metadata': {
@@ -118,10 +115,9 @@ def test_invalid_restart_inputs_raise(vasp_code, poscar, with_pbe_potcars,
 
 @pytest.mark.parametrize('switch', [True, False])
 def test_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
-                                 monkeypatch):
+                                 monkeypatch, vasp_calculation_class):
     import pathlib
     from aiida.orm import RemoteData
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -136,7 +132,7 @@ def test_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
         'restart': {'folder': remote_data, 'contcar_to_poscar': switch},
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     # mock the is_neb() method to avoid the search of the remote_folders
     # parent CalcJobNode (we know it's **not** a NEB calculation!)
     monkeypatch.setattr(VaspCalculation, 'is_neb', lambda self: False)
@@ -164,10 +160,10 @@ def test_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
 @pytest.mark.parametrize('use_kpoints', [False, True])
 def test_defined_inputs_are_preferred(use_incar, use_kpoints, tmpdir,
                                       vasp_code, aiida_sandbox, incar,
-                                      kpoints, monkeypatch):
+                                      kpoints, monkeypatch,
+                                      vasp_calculation_class):
     import pathlib
     from aiida.orm import RemoteData
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
 
     # set the input plugin for code
@@ -187,7 +183,7 @@ def test_defined_inputs_are_preferred(use_incar, use_kpoints, tmpdir,
         inputs.update({'incar': incar})
     if use_kpoints:
         inputs.update({'kpoints': kpoints})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     # mock the is_neb() method to avoid the search of the remote_folders
     # parent CalcJobNode (we know it's **not** a NEB calculation!)
     monkeypatch.setattr(VaspCalculation, 'is_neb', lambda self: False)
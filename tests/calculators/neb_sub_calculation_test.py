@@ -6,9 +6,8 @@ import pytest
 
 @pytest.mark.parametrize('valid_input', ['incar', 'kpoints', 'neb_path',
                          'potcar', 'restart'])
-def test_neb_input_port_availability(valid_input):
-    from aiida.plugins import CalculationFactory
-    inputs = CalculationFactory('cusp.vasp').get_builder()._valid_fields
+def test_neb_input_port_availability(valid_input, vasp_calculation_class):
+    inputs = vasp_calculation_class.get_builder()._valid_fields
     assert valid_input in inputs
 
 
@@ -20,8 +19,8 @@ def test_neb_input_port_availability(valid_input):
 @pytest.mark.filterwarnings("ignore::UserWarning")
 def test_missing_neb_input_raises(incar, kpoints, poscar, with_pbe_potcars,
                                   vasp_code, aiida_sandbox, use_incar,
-                                  use_potcar, use_kpoints):
-    from aiida.plugins import CalculationFactory
+                                  use_potcar, use_kpoints,
+                                  vasp_calculation_class):
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -38,7 +37,7 @@ def test_missing_neb_input_raises(incar, kpoints, poscar, with_pbe_potcars,
         inputs.update({'kpoints': kpoints})
     if use_potcar:
         inputs.update({'potcar': VaspPotcarData.from_structure(poscar, 'pbe')})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_neb_calc = VaspCalculation(inputs=inputs)
     # this should pass
     if all([use_incar, use_kpoints, use_potcar]):
@@ -57,8 +56,7 @@ def test_missing_neb_input_raises(incar, kpoints, poscar, with_pbe_potcars,
 def test_wrong_neb_path_identifer_raises(vasp_code, cstdn_code, incar, kpoints,
                                          poscar, with_pbe_potcars,
                                          aiida_sandbox, prefix, main_key,
-                                         suffix):
-    from aiida.plugins import CalculationFactory
+                                         suffix, vasp_calculation_class):
     from aiida_cusp.data import VaspPotcarData
     neb_path = {}
     for i in range(3):
@@ -80,7 +78,7 @@ def test_wrong_neb_path_identifer_raises(vasp_code, cstdn_code, incar, kpoints,
         'neb_path': neb_path,
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_neb_calc = VaspCalculation(inputs=inputs)
     with pytest.raises(Exception) as exception:
         vasp_neb_calc.prepare_for_submission(aiida_sandbox)
@@ -92,9 +90,9 @@ def test_wrong_neb_path_identifer_raises(vasp_code, cstdn_code, incar, kpoints,
 # not like my test "potential"
 @pytest.mark.filterwarnings("ignore::UserWarning")
 def test_vasp_neb_calculation_setup(vasp_code, cstdn_code, incar, kpoints,
-                                    poscar, with_pbe_potcars, aiida_sandbox):
+                                    poscar, with_pbe_potcars, aiida_sandbox,
+                                    vasp_calculation_class):
     import pathlib
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -110,7 +108,7 @@ def test_vasp_neb_calculation_setup(vasp_code, cstdn_code, incar, kpoints,
         'potcar': potcar_linklist,
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_neb_calc = VaspCalculation(inputs=inputs)
     vasp_neb_calc.prepare_for_submission(aiida_sandbox)
     sandbox = pathlib.Path(aiida_sandbox.abspath)
@@ -142,8 +140,8 @@ def test_vasp_neb_calculation_setup(vasp_code, cstdn_code, incar, kpoints,
 
 @pytest.mark.parametrize('invalid_input', ['neb_path', 'potcar'])
 def test_invalid_restart_neb_inputs_raise(vasp_code, poscar, with_pbe_potcars,
-                                          invalid_input):
-    from aiida.plugins import CalculationFactory
+                                          invalid_input,
+                                          vasp_calculation_class):
     from aiida_cusp.data import VaspPotcarData
     inputs = {
         'code': vasp_code,
@@ -155,7 +153,7 @@ def test_invalid_restart_neb_inputs_raise(vasp_code, poscar, with_pbe_potcars,
     if invalid_input == 'potcar':
         potcar = VaspPotcarData.from_structure(poscar, 'pbe')
         inputs.update({'potcar': potcar})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_neb_calculation = VaspCalculation(inputs=inputs)
     with pytest.raises(Exception) as exception:
         # need to call the name mangeled protected method explicitly
@@ -167,10 +165,9 @@ def test_invalid_restart_neb_inputs_raise(vasp_code, poscar, with_pbe_potcars,
 
 @pytest.mark.parametrize('switch', [True, False])
 def test_neb_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
-                                     monkeypatch):
+                                     monkeypatch, vasp_calculation_class):
     import pathlib
     from aiida.orm import RemoteData
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -188,7 +185,7 @@ def test_neb_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
         'restart': {'folder': remote_data, 'contcar_to_poscar': switch},
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     # mock the is_neb() method to avoid the search of the remote_folders
     # parent CalcJobNode (we know it **is** a NEB calculation!)
     monkeypatch.setattr(VaspCalculation, 'is_neb', lambda self: True)
@@ -223,10 +220,10 @@ def test_neb_poscar_overwrite_switch(switch, tmpdir, vasp_code, aiida_sandbox,
 @pytest.mark.parametrize('use_kpoints', [False, True])
 def test_neb_defined_inputs_are_preferred(use_incar, use_kpoints, tmpdir,
                                           vasp_code, aiida_sandbox, incar,
-                                          kpoints, monkeypatch):
+                                          kpoints, monkeypatch,
+                                          vasp_calculation_class):
     import pathlib
     from aiida.orm import RemoteData
-    from aiida.plugins import CalculationFactory
     from aiida_cusp.data import VaspPotcarData
     # set the input plugin for code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp_neb')
@@ -245,7 +242,7 @@ def test_neb_defined_inputs_are_preferred(use_incar, use_kpoints, tmpdir,
         inputs.update({'incar': incar})
     if use_kpoints:
         inputs.update({'kpoints': kpoints})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     # mock the is_neb() method to avoid the search of the remote_folders
     # parent CalcJobNode (we know it **is** a NEB calculation!)
     monkeypatch.setattr(VaspCalculation, 'is_neb', lambda self: True)
@@ -12,8 +12,7 @@ import pytest
     (True, False, ""),
 ])
 def test_verify_structure_input(vasp_code, poscar, use_poscar, use_neb_path,
-                                expected_error):
-    from aiida.plugins import CalculationFactory
+                                expected_error, vasp_calculation_class):
     from aiida.orm import RemoteData
     # define code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
@@ -27,7 +26,7 @@ def test_verify_structure_input(vasp_code, poscar, use_poscar, use_neb_path,
     if use_neb_path:
         neb_path = {'node_00': poscar, 'node_01': poscar, 'node_02': poscar}
         inputs.update({'neb_path': neb_path})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_calc = VaspCalculation(inputs=inputs)
     if expected_error:
         with pytest.raises(Exception) as exception:
@@ -39,10 +38,9 @@ def test_verify_structure_input(vasp_code, poscar, use_poscar, use_neb_path,
 
 @pytest.mark.parametrize('is_restart', [True, False])
 @pytest.mark.parametrize('is_neb', [True, False])
-def test_is_neb(vasp_code, poscar, is_restart, is_neb):
+def test_is_neb(vasp_code, poscar, is_restart, is_neb, vasp_calculation_class):
     from aiida.orm import RemoteData
     from aiida.common.links import LinkType
-    from aiida.plugins import CalculationFactory
     from aiida.engine import run_get_node
     from aiida_cusp.data import VaspPotcarData
     # define code
@@ -57,7 +55,7 @@ def test_is_neb(vasp_code, poscar, is_restart, is_neb):
         inputs.update({'neb_path': neb_path})
     else:
         inputs.update({'poscar': poscar})
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_calc_base = VaspCalculation(inputs=inputs)
     # if restart create a second calculator using a remote_folder connected
     # to the first calculation as input
@@ -112,8 +110,7 @@ def test_all_calculation_inputs(vasp_code, cstdn_code, incar, kpoints, poscar,
     run(VaspCalculation, **inputs)
 
 
-def test_get_connected_parser_name_method(vasp_code):
-    from aiida.plugins import CalculationFactory
+def test_get_connected_parser_name_method(vasp_code, vasp_calculation_class):
     # define some individual parser name
     pname = "myindividualparsername"
     # define code
@@ -127,19 +124,18 @@ def test_get_connected_parser_name_method(vasp_code):
             },
         },
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     vasp_calc_base = VaspCalculation(inputs=inputs)
     # retrieve and compare parser name
     parser_name_from_calc = vasp_calc_base.get_connected_parser_name()
     assert parser_name_from_calc == pname
 
 
-def test_expected_files_method(vasp_code, monkeypatch):
-    from aiida.plugins import CalculationFactory
+def test_expected_files_method(vasp_code, monkeypatch, vasp_calculation_class):
     from aiida.plugins import ParserFactory
 
     # load default calculation and parser classes
-    VaspCalculation = CalculationFactory('cusp.vasp')
+    VaspCalculation = vasp_calculation_class
     VaspFileParser = ParserFactory('cusp.default')
 
     # monkeypatch expected_files() method on parser class to return
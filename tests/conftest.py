@@ -19,6 +19,17 @@ def auto_clear_aiidadb(clear_database):
     pass
 
 
+def store_nodes(nodes):
+    """
+    Store all given nodes within a single transaction
+    """
+    from aiida.manage import get_manager
+    storage = get_manager().get_profile_storage()
+    with storage.transaction():
+        for node in nodes:
+            node.store()
+
+
 @pytest.fixture(scope='function')
 def testdata(request):
     """
@@ -32,6 +43,36 @@ def testdata(request):
     return module_dir / testdata_dir
 
 
+@pytest.fixture(scope='module')
+def pmg_vasprun(request):
+    """
+    Parse the vasprun.xml file located in the calling test module's
+    '.testdata' folder only once per module using pymatgen's Vasprun class
+
+    Note: the returned object is shared among tests and must not be modified
+    """
+    import pathlib
+    from pymatgen.io.vasp.outputs import Vasprun
+    from aiida_cusp.utils.defaults import VasprunParsingDefaults
+    module_dir = pathlib.Path(request.fspath).parent
+    vasprun_xml = module_dir / '.testdata' / 'vasprun.xml'
+    yield Vasprun(vasprun_xml, **VasprunParsingDefaults.PARSER_ARGS)
+
+
+@pytest.fixture(scope='module')
+def pmg_outcar(request):
+    """
+    Parse the OUTCAR file located in the calling test module's '.testdata'
+    folder only once per module using pymatgen's Outcar class
+
+    Note: the returned object is shared among tests and must not be modified
+    """
+    import pathlib
+    from pymatgen.io.vasp.outputs import Outcar
+    module_dir = pathlib.Path(request.fspath).parent
+    yield Outcar(module_dir / '.testdata' / 'OUTCAR')
+
+
 @pytest.fixture(scope='function')
 def interactive_potcar_file(tmpdir):
     """
@@ -45,16 +86,23 @@ def interactive_potcar_file(tmpdir):
             """Setup internal variables."""
             self._tmpfolder = pathlib.Path(tmpdir)
             self._filepath = None
+            self._filepath_str = None
             self._file = None
 
         @property
         def filepath(self):
-            """Return the path to the file as string."""
-            return str(self._filepath.absolute())
+            """Return the (absolute) path to the file as string."""
+            return self._filepath_str
+
+        @property
+        def path(self):
+            """Return the (absolute) path to the file as pathlib.Path."""
+            return self._filepath
 
         def open(self, filename):
             """Open file with name `filename`."""
-            self._filepath = self._tmpfolder / filename
+            self._filepath = (self._tmpfolder / filename).absolute()
+            self._filepath_str = str(self._filepath)
             self._file = open(self._filepath, 'a+')
 
         def write(self, content):
@@ -76,6 +124,7 @@ def interactive_potcar_file(tmpdir):
                 self._filepath.unlink()
             self._file = None
             self._filepath = None
+            self._filepath_str = None
 
         def check_file_open(self):
             """Check if file handle is available."""
@@ -85,6 +134,48 @@ def interactive_potcar_file(tmpdir):
     yield InteractivePotcar(tmpdir)
 
 
+@pytest.fixture(scope='session')
+def empty_potcar_file(tmp_path_factory):
+    """
+    Create an empty POTCAR file shared among all tests and return its
+    (absolute) path as string.
+    """
+    path_to_potcar = tmp_path_factory.mktemp('empty_potcar') / 'POTCAR'
+    path_to_potcar.touch()
+    yield str(path_to_potcar.absolute())
+
+
+@pytest.fixture(scope='session', params=['', 'has/sub/folder'])
+def retrieved_files_tree(request, tmp_path_factory):
+    """
+    Create a fictitious set of files retrieved from a calculation located in
+    a (possibly nested) subfolder of a temporary folder shared among all
+    tests.
+
+    Returns the (absolute) path to the temporary folder, the subfolder
+    containing the files and the list of created file names. Note that tests
+    must not modify the created files.
+    """
+    filelist = ['INCAR', 'POSCAR', 'CONTCAR', 'vasprun.xml', 'OUTCAR',
+                'W3287382.tmp']
+    root = tmp_path_factory.mktemp('retrieved').absolute()
+    folder = root / request.param
+    folder.mkdir(parents=True, exist_ok=True)
+    for filename in filelist:
+        (folder / filename).touch()
+    yield root, request.param, filelist
+
+
+@pytest.fixture(scope='session')
+def abs_cwd():
+    """
+    Return the absolute path of the current working directory at the
+    start of the session as pathlib.Path
+    """
+    import pathlib
+    yield pathlib.Path().absolute()
+
+
 @pytest.fixture(scope='function')
 def temporary_cwd(tmpdir):
     """
@@ -129,6 +220,22 @@ def minimal_pymatgen_structure():
     yield pymatgen_structure
 
 
+@pytest.fixture(scope='session')
+def minimal_pymatgen_supercell():
+    """
+    Create a 2x2x2 supercell of the minimal pymatgen structure (see
+    `minimal_pymatgen_structure()`) containing eight hydrogen atoms.
+
+    Note: the supercell is shared among all tests and must not be modified!
+    """
+    from pymatgen.core import Lattice, Structure
+    lattice = Lattice.cubic(1.0)
+    species = ['H']
+    coords = [[.0, .0, .0]]
+    pymatgen_structure = Structure(lattice, species, coords)
+    yield pymatgen_structure * (2, 2, 2)
+
+
 @pytest.fixture(scope='function')
 def multi_component_structure():
     """
@@ -148,6 +255,27 @@ def multi_component_structure():
     yield structure
 
 
+@pytest.fixture(scope='function', params=['pymatgen', 'aiida', 'poscar',
+                                          'aiida_cusp_poscar'])
+def structure_converter(request):
+    """
+    Return a function converting a pymatgen structure to one of the
+    different supported structure types (i.e. pymatgen, aiida, poscar and
+    aiida_cusp_poscar)
+    """
+    from pymatgen.io.vasp.inputs import Poscar
+    from aiida.orm import StructureData
+    from aiida_cusp.data import VaspPoscarData
+    converters = {
+        'pymatgen': lambda structure: structure,
+        'aiida': lambda structure: StructureData(pymatgen_structure=structure),
+        'poscar': lambda structure: Poscar(structure),
+        'aiida_cusp_poscar': lambda structure: VaspPoscarData(
+            structure=structure),
+    }
+    yield converters[request.param]
+
+
 @pytest.fixture(scope='function')
 def vasp_code(computer):
     """
@@ -229,7 +357,6 @@ def with_pbe_potcars(interactive_potcar_file):
     """
     Create and store a set of (PBE) potcars used in the different tests
     """
-    import pathlib
     from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
     # define the basic attributes of the potentials stored to the set
     potcar_contents = [
@@ -297,26 +424,159 @@ def with_pbe_potcars(interactive_potcar_file):
         # write the new pseudo-potential contents to the file and store it
         # to the database
         interactive_potcar_file.write(potcar_content)
-        path_to_potcar = pathlib.Path(interactive_potcar_file.filepath)
+        path_to_potcar = interactive_potcar_file.path
         node = VaspPotcarFile.add_potential(path_to_potcar, name=name,
                                             functional=functional)
         node.store()
 
 
 @pytest.fixture(scope='function')
-def vasp_file_parser(vasp_code):
+def stored_si_potcar(interactive_potcar_file):
     """
-    Define VaspFileParser initialized with calculation node
+    Create, store and return a single (empty) Si potential for the PBE
+    functional.
+    """
+    from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
+    interactive_potcar_file.open("POTCAR")
+    path = interactive_potcar_file.path
+    args = ['Si', 'Si', 10000101, 'pbe', 'hash']
+    yield VaspPotcarFile(path, *args).store()
+
+
+@pytest.fixture(scope='function')
+def multi_component_linklist(with_pbe_potcars, multi_component_structure):
+    """
+    Setup the VaspPoscarData node and the (default) PBE element-potential map
+    for the multi-component structure.
+    """
+    from aiida_cusp.data import VaspPoscarData, VaspPotcarData
+    poscar = VaspPoscarData(structure=multi_component_structure)
+    potmap = VaspPotcarData.from_structure(multi_component_structure, 'pbe')
+    yield poscar, potmap
+
+
+@pytest.fixture(scope='function')
+def with_ge_si_potcars(interactive_potcar_file):
+    """
+    Create and store a small set of Ge and Si potentials with different
+    names and versions.
+
+    Note: the fixture is function scoped because the database is cleared
+    after each test (see `auto_clear_aiidadb()`)
+    """
+    from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
+    potcar_args = [
+        ['Ge_a', 'Ge', 10000101, 'lda_us', 'hash1'],
+        ['Ge_a', 'Ge', 10000102, 'lda_us', 'hash2'],
+        ['Ge_b', 'Ge', 10000101, 'lda_us', 'hash3'],
+        ['Ge_b', 'Ge', 10000102, 'lda_us', 'hash4'],
+        ['Si_a', 'Si', 10000101, 'lda_us', 'hash5'],
+        ['Si_a', 'Si', 10000102, 'lda_us', 'hash6'],
+        ['Si_b', 'Si', 10000101, 'lda_us', 'hash7'],
+        ['Si_b', 'Si', 10000102, 'lda_us', 'hash8'],
+    ]
+    interactive_potcar_file.open("POTCAR")
+    path = interactive_potcar_file.filepath
+    store_nodes([VaspPotcarFile(path, *args) for args in potcar_args])
+
+
+@pytest.fixture(scope='function')
+def with_h_potcars(empty_potcar_file):
+    """
+    Create and store a set of hydrogen potcars with different names,
+    versions and functionals.
+
+    Note: the fixture is function scoped because the database is cleared
+    after each test (see `auto_clear_aiidadb()`)
+    """
+    from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
+    potcar_args = [
+        ['H', 'H', 10000101, 'pbe', 'hash1'],
+        ['H', 'H', 10000102, 'pbe', 'hash2'],
+        ['H_pv', 'H', 10000101, 'pbe', 'hash3'],
+        ['H_pv', 'H', 10000102, 'pbe', 'hash4'],
+        ['H', 'H', 10000101, 'pw91', 'hash5'],
+        ['H', 'H', 10000102, 'pw91', 'hash6'],
+        ['H_pv', 'H', 10000101, 'pw91', 'hash7'],
+        ['H_pv', 'H', 10000102, 'pw91', 'hash8'],
+    ]
+    store_nodes([VaspPotcarFile(empty_potcar_file, *args)
+                 for args in potcar_args])
+
+
+@pytest.fixture(scope='session')
+def cached_data_factory():
+    """
+    Return AiiDA's DataFactory with entry point lookups cached for the
+    whole session
+    """
+    import functools
+    from aiida.plugins import DataFactory
+    yield functools.lru_cache(maxsize=None)(DataFactory)
+
+
+@pytest.fixture(scope='session')
+def vasp_calculation_class():
+    """
+    Load the VASP calculation class from its entry point (only once per
+    session)
     """
     from aiida.plugins import CalculationFactory
-    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
+    yield CalculationFactory('cusp.vasp')
+
+
+@pytest.fixture(scope='function')
+def vasp_calc_inputs(vasp_code):
+    """
+    Setup the minimal inputs for a VASP calculation (additional options
+    may be added to the returned inputs by the calling test)
+    """
     # define code
     vasp_code.set_attribute('input_plugin', 'cusp.vasp')
-    # setup calculator
-    inputs = {
+    yield {
         'code': vasp_code,
         'metadata': {'options': {'resources': {'num_machines': 1}}},
     }
-    VaspCalculation = CalculationFactory('cusp.vasp')
-    vasp_calc_node = VaspCalculation(inputs=inputs).node
-    yield VaspFileParser(vasp_calc_node)
+
+
+@pytest.fixture(scope='function')
+def vasp_calc_node(vasp_calc_inputs, vasp_calculation_class):
+    """
+    Setup a VASP calculation node using the default options
+    """
+    yield vasp_calculation_class(inputs=vasp_calc_inputs).node
+
+
+@pytest.fixture(scope='module')
+def parser_calc_node(aiida_profile, vasp_calculation_class):
+    """
+    Setup a bare (unstored) VASP calculation node shared by all parser tests
+    of a module
+
+    Contrary to `vasp_calc_node()` the node is not created by instantiating
+    the calculation class and only provides the process type required by
+    the parser
+    """
+    from aiida.orm import CalcJobNode
+    node = CalcJobNode()
+    node.process_type = vasp_calculation_class.build_process_type()
+    yield node
+
+
+@pytest.fixture(scope='function')
+def vasp_file_parser(parser_calc_node):
+    """
+    Define VaspFileParser initialized with calculation node
+    """
+    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
+    yield VaspFileParser(parser_calc_node)
+
+
+@pytest.fixture(scope='module')
+def vasp_file_parser_static(parser_calc_node):
+    """
+    Define VaspFileParser initialized with calculation node shared by all
+    tests of a module (tests using this fixture must not modify the parser)
+    """
+    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
+    yield VaspFileParser(parser_calc_node)
@@ -36,8 +36,8 @@ from aiida_cusp.utils.exceptions import KpointWrapperError
 ])
 def test_store_and_load_kpoint_data_density(kpoint_params, structure,
                                             sympath,
-                                            minimal_pymatgen_structure):
-    from aiida.plugins import DataFactory
+                                            minimal_pymatgen_structure,
+                                            cached_data_factory):
     from aiida.orm import load_node
     # setup minimal structure and high symmetry path
     struct = minimal_pymatgen_structure
@@ -49,7 +49,7 @@ def test_store_and_load_kpoint_data_density(kpoint_params, structure,
     if sympath:
         kpoint_params.update({'sympath': path})
     # setup the kpoint data object
-    KpointData = DataFactory('cusp.kpoints')
+    KpointData = cached_data_factory('cusp.kpoints')
     kpoints_set = KpointData(kpoints=kpoint_params, structure=struct)
     # store and reload the object and finally compare to original inputs
     uuid = kpoints_set.store().uuid
@@ -71,8 +71,7 @@ def test_store_and_load_kpoint_data_density(kpoint_params, structure,
     ({'mode': 'line', 'kpoints': 100}, False, True),
 ])
 def test_write_file_method(kpoint_params, structure, sympath, tmpdir,
-                           minimal_pymatgen_structure):
-    from aiida.plugins import DataFactory
+                           minimal_pymatgen_structure, cached_data_factory):
     # setup minimal structure and high symmetry path
     struct = minimal_pymatgen_structure
     path = HighSymmKpath(struct, path_type='setyawan_curtarolo')
@@ -83,7 +82,7 @@ def test_write_file_method(kpoint_params, structure, sympath, tmpdir,
     if sympath:
         kpoint_params.update({'sympath': path})
     # setup the kpoint data object
-    KpointData = DataFactory('cusp.kpoints')
+    KpointData = cached_data_factory('cusp.kpoints')
     kpoints = KpointData(kpoints=kpoint_params, structure=struct)
     # write node contents to file
     filepath = pathlib.Path(tmpdir) / 'KPOINTS'
@@ -98,10 +98,10 @@ def test_poscar_velocities(minimal_pymatgen_structure, v1, v2, v3):
     (None, None, 300.0),
 ])
 def test_store_and_load_poscar_data(minimal_pymatgen_structure, constraints,
-                                    velocities, temperature):
-    from aiida.plugins import DataFactory
+                                    velocities, temperature,
+                                    cached_data_factory):
     from aiida.orm import load_node
-    PoscarData = DataFactory('cusp.poscar')
+    PoscarData = cached_data_factory('cusp.poscar')
     # assure at least two atoms are present in the structure to allow for
     # initialization of velocities from temperature
     if temperature is not None:
@@ -123,15 +123,15 @@ def test_store_and_load_poscar_data(minimal_pymatgen_structure, constraints,
     (None, None, 300.0),
 ])
 def test_write_file_method(minimal_pymatgen_structure, tmpdir,
-                           velocities, constraints, temperature):
-    from aiida.plugins import DataFactory
+                           velocities, constraints, temperature,
+                           cached_data_factory):
     # assure at least two atoms are present in the structure to allow for
     # initialization of velocities from temperature
     if temperature is not None:
         pymatgen_structure = minimal_pymatgen_structure * (2, 1, 1)
     else:
         pymatgen_structure = minimal_pymatgen_structure
-    PoscarData = DataFactory('cusp.poscar')
+    PoscarData = cached_data_factory('cusp.poscar')
     poscar = PoscarData(structure=pymatgen_structure,
                         constraints=constraints, velocities=velocities,
                         temperature=temperature)
@@ -4,10 +4,9 @@ Test suite for the VaspPotcarFile and VaspPotcarData datatypes
 """
 
 import pytest
-import pathlib
 
 from pymatgen.io.vasp.inputs import Poscar
-from aiida.orm import StructureData
+from aiida.orm import StructureData, load_node
 
 from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile, VaspPotcarData
 from aiida_cusp.data.inputs.vasp_poscar import VaspPoscarData
@@ -18,11 +17,28 @@ from aiida_cusp.utils.defaults import VaspDefaults
 from aiida_cusp.utils import PotcarParser
 
 
+# minimal potential contents which can be processed by the PotcarParser
+_POTCAR_SI_CONTENTS = "\n".join([
+    "functional Si 01Jan2000",
+    "parameters from PSCTR are:",
+    "VRHFIN =Si: s100p100d100",
+    "TITEL  = functional Xy 01Jan1000"
+    "END of PSCTR-controll parameters",
+])
+# same as above but created 01Jan1000 (i.e. potential version 10000101)
+_POTCAR_SI_CONTENTS_V10000101 = "\n".join([
+    "functional Si 01Jan1000",
+    "parameters from PSCTR are:",
+    "VRHFIN =Si: s100p100d100",
+    "TITEL  = functional Si 01Jan1000"
+    "END of PSCTR-controll parameters",
+])
+
+
 #
 # Tests for VaspPotcarFile class
 #
 def test_store_and_load_potcar_file(interactive_potcar_file):
-    from aiida.orm import load_node
     # potcar contents and attributes
     contents = "potcar file contents!"
     name = 'Ge_abc_de'
@@ -54,11 +70,9 @@ def test_store_and_load_potcar_file(interactive_potcar_file):
     ('Ge_abc', 'Ge', 10000000, 'lda_us', 'hash'),  # invalid version
     ('Ge_abc', 'Ge', 10000101, 'abcdef', 'hash'),  # invalid functional
 ])
-def test_invalid_attributes_raise(interactive_potcar_file, potential_attrs):
-    interactive_potcar_file.open("POTCAR")
-    path_to_potcar = interactive_potcar_file.filepath
+def test_invalid_attributes_raise(empty_potcar_file, potential_attrs):
     with pytest.raises(VaspPotcarFileError) as exception:
-        potcar_node = VaspPotcarFile(path_to_potcar, *potential_attrs)
+        potcar_node = VaspPotcarFile(empty_potcar_file, *potential_attrs)
 
 
 @pytest.mark.parametrize('query_args,num_match_expected',
@@ -76,23 +90,7 @@ def test_invalid_attributes_raise(interactive_potcar_file, potential_attrs):
     ({'checksum': 'hash5'}, 1),
 ])
 def test_get_potential_from_tags(query_args, num_match_expected,
-                                 interactive_potcar_file):
-    # build smalle potential database
-    interactive_potcar_file.open("POTCAR")
-    path_to_potcar = interactive_potcar_file.filepath
-    potcar_identifiers = [
-        ['Ge_a', 'Ge', 10000101, 'lda_us', 'hash1'],
-        ['Ge_a', 'Ge', 10000102, 'lda_us', 'hash2'],
-        ['Ge_b', 'Ge', 10000101, 'lda_us', 'hash3'],
-        ['Ge_b', 'Ge', 10000102, 'lda_us', 'hash4'],
-        ['Si_a', 'Si', 10000101, 'lda_us', 'hash5'],
-        ['Si_a', 'Si', 10000102, 'lda_us', 'hash6'],
-        ['Si_b', 'Si', 10000101, 'lda_us', 'hash7'],
-        ['Si_b', 'Si', 10000102, 'lda_us', 'hash8'],
-    ]
-    for identifiers in potcar_identifiers:
-        node = VaspPotcarFile(path_to_potcar, *identifiers)
-        node.store()
+                                 with_ge_si_potcars):
     # perform different queries using the from_tags() method
     query_result = VaspPotcarFile.from_tags(**query_args)
     assert len(query_result) == num_match_expected
@@ -100,15 +98,8 @@ def test_get_potential_from_tags(query_args, num_match_expected,
 
 def test_potcar_is_unique_method(interactive_potcar_file):
     # generate arbitrary potential and process it using the potcar parser
-    potential_contents = "\n".join([
-        "functional Si 01Jan2000",
-        "parameters from PSCTR are:",
-        "VRHFIN =Si: s100p100d100",
-        "TITEL  = functional Xy 01Jan1000"
-        "END of PSCTR-controll parameters",
-    ])
     interactive_potcar_file.open("POTCAR")
-    interactive_potcar_file.write(potential_contents)
+    interactive_potcar_file.write(_POTCAR_SI_CONTENTS)
     path_to_potcar = interactive_potcar_file.filepath
     potcar_parser = PotcarParser(path_to_potcar, functional='pbe',
                                  name='Si_abc')
@@ -130,18 +121,30 @@ def test_potcar_is_unique_method(interactive_potcar_file):
     assert "Potential with matching identifiers" in str(exception.value)
 
 
+def test_potcar_is_unique_same_contents(interactive_potcar_file):
+    # uniqueness is only decided by the identifiers, i.e. potentials with
+    # identical contents but different identifiers are unique
+    interactive_potcar_file.open("POTCAR")
+    interactive_potcar_file.write(_POTCAR_SI_CONTENTS)
+    path_to_potcar = interactive_potcar_file.filepath
+    potcar_parser = PotcarParser(path_to_potcar, functional='pbe',
+                                 name='Si_abc')
+    node = VaspPotcarFile(path_to_potcar, potcar_parser.name,
+                          potcar_parser.element, potcar_parser.version,
+                          potcar_parser.functional, potcar_parser.hash)
+    node.store()
+    potcar_parser.name = 'Si_def'
+    assert VaspPotcarFile.is_unique(potcar_parser) is True
+    potcar_parser.name = 'Si_abc'
+    potcar_parser.functional = 'pbe_54'
+    assert VaspPotcarFile.is_unique(potcar_parser) is True
+
+
 def test_add_potential_classmethod(interactive_potcar_file):
     # generate arbitrary potential and process it using the potcar parser
-    potential_contents = "\n".join([
-        "functional Si 01Jan2000",
-        "parameters from PSCTR are:",
-        "VRHFIN =Si: s100p100d100",
-        "TITEL  = functional Xy 01Jan1000"
-        "END of PSCTR-controll parameters",
-    ])
     interactive_potcar_file.open("POTCAR")
-    interactive_potcar_file.write(potential_contents)
-    path_to_potcar = pathlib.Path(interactive_potcar_file.filepath)
+    interactive_potcar_file.write(_POTCAR_SI_CONTENTS)
+    path_to_potcar = interactive_potcar_file.path
     potcar_parser = PotcarParser(path_to_potcar, functional='pbe',
                                  name='Si_abc')
     potcar_node = VaspPotcarFile.add_potential(path_to_potcar, name='Si_abc',
@@ -157,18 +160,10 @@ def test_add_potential_classmethod(interactive_potcar_file):
 # Tests for VaspPotcarData class
 #
 def test_store_and_load_potcar_data(interactive_potcar_file):
-    from aiida.orm import load_node
     # generate arbitrary potential and process it using the potcar parser
-    potential_contents = "\n".join([
-        "functional Si 01Jan1000",
-        "parameters from PSCTR are:",
-        "VRHFIN =Si: s100p100d100",
-        "TITEL  = functional Si 01Jan1000"
-        "END of PSCTR-controll parameters",
-    ])
     interactive_potcar_file.open("POTCAR")
-    interactive_potcar_file.write(potential_contents)
-    path_to_potcar = pathlib.Path(interactive_potcar_file.filepath)
+    interactive_potcar_file.write(_POTCAR_SI_CONTENTS_V10000101)
+    path_to_potcar = interactive_potcar_file.path
     potcar_file_node = VaspPotcarFile.add_potential(path_to_potcar, name='Si',
                                                     functional='pbe')
     potcar_file_node.store()
@@ -206,12 +201,8 @@ def test_init_from_tags_raises_on_missing_node():
     assert "Unable to initialize VaspPotcarData" in str(exception.value)
 
 
-def test_load_potential_file_node_from_uuid(interactive_potcar_file):
-    # generate arbitrary potential and process it using the potcar parser
-    interactive_potcar_file.open("POTCAR")
-    path = pathlib.Path(interactive_potcar_file.filepath).absolute()
-    args = ['Si', 'Si', 10000101, 'pbe', 'hash']
-    potcar_file_set = VaspPotcarFile(path, *args).store()
+def test_load_potential_file_node_from_uuid(stored_si_potcar):
+    potcar_file_set = stored_si_potcar
     # create VaspPotcarData instance associated with the stored potential
     potcar_data = VaspPotcarData(name='Si', version=10000101, functional='pbe')
     # load node from potcar_data instance
@@ -223,12 +214,8 @@ def test_load_potential_file_node_from_uuid(interactive_potcar_file):
     assert potcar_file_get.name == potcar_file_set.name
 
 
-def test_load_potential_file_node_from_hash(interactive_potcar_file):
-    # generate arbitrary potential and process it using the potcar parser
-    interactive_potcar_file.open("POTCAR")
-    path = pathlib.Path(interactive_potcar_file.filepath).absolute()
-    args = ['Si', 'Si', 10000101, 'pbe', 'hash']
-    potcar_file_set = VaspPotcarFile(path, *args).store()
+def test_load_potential_file_node_from_hash(stored_si_potcar):
+    potcar_file_set = stored_si_potcar
     # create VaspPotcarData instance associated with the stored potential but
     # change the associated uuid
     potcar_data = VaspPotcarData(name='Si', version=10000101, functional='pbe')
@@ -243,12 +230,8 @@ def test_load_potential_file_node_from_hash(interactive_potcar_file):
     assert potcar_file_get.name == potcar_file_set.name
 
 
-def test_load_potential_file_raises_on_undiscoverable(interactive_potcar_file):
-    # generate arbitrary potential and process it using the potcar parser
-    interactive_potcar_file.open("POTCAR")
-    path = pathlib.Path(interactive_potcar_file.filepath).absolute()
-    args = ['Si', 'Si', 10000101, 'pbe', 'hash']
-    potcar_file_set = VaspPotcarFile(path, *args).store()
+def test_load_potential_file_raises_on_undiscoverable(stored_si_potcar):
+    potcar_file_set = stored_si_potcar
     # create VaspPotcarData instance associated with the stored potential but
     # change uuid and hash to make the potentials undiscoverable
     potcar_data = VaspPotcarData(name='Si', version=10000101, functional='pbe')
@@ -262,12 +245,8 @@ def test_load_potential_file_raises_on_undiscoverable(interactive_potcar_file):
 
 @pytest.mark.parametrize('change_prop', ['name', 'version', 'functional',
                          'element', 'hash'])
-def test_load_potential_file_node_properties_match(interactive_potcar_file,
+def test_load_potential_file_node_properties_match(stored_si_potcar,
                                                    change_prop):
-    interactive_potcar_file.open("POTCAR")
-    path = pathlib.Path(interactive_potcar_file.filepath).absolute()
-    args = ['Si', 'Si', 10000101, 'pbe', 'hash']
-    file_node = VaspPotcarFile(path, *args).store()
     # create VaspPotcarData instance associated with the stored potential and
     # change one of the properties
     potcar_data = VaspPotcarData(name='Si', version=10000101, functional='pbe')
@@ -283,36 +262,11 @@ def test_load_potential_file_node_properties_match(interactive_potcar_file,
 # this is a user-space method: also check that the passed functionals are not
 # treated case-sensitive!
 @pytest.mark.parametrize('functional', ['pbe', 'pw91', 'PBE', 'PW91'])
-@pytest.mark.parametrize('structure_type', ['pymatgen', 'aiida', 'poscar',
-                         'aiida_cusp_poscar'])
-def test_from_structure_classmethod_single(name, interactive_potcar_file,
-                                           version, functional, structure_type,
-                                           minimal_pymatgen_structure):
+def test_from_structure_classmethod_single(name, with_h_potcars, version,
+                                           functional, structure_converter,
+                                           minimal_pymatgen_supercell):
     # create non-ordered structures of different types
-    supercell = minimal_pymatgen_structure * (2, 2, 2)
-    if structure_type == 'pymatgen':
-        structure = supercell
-    elif structure_type == 'aiida':
-        structure = StructureData(pymatgen_structure=supercell)
-    elif structure_type == 'poscar':
-        structure = Poscar(supercell)
-    elif structure_type == 'aiida_cusp_poscar':
-        structure = VaspPoscarData(structure=supercell)
-    # populate database with potentials
-    potcar_args = [
-        ['H', 'H', 10000101, 'pbe', 'hash1'],
-        ['H', 'H', 10000102, 'pbe', 'hash2'],
-        ['H_pv', 'H', 10000101, 'pbe', 'hash3'],
-        ['H_pv', 'H', 10000102, 'pbe', 'hash4'],
-        ['H', 'H', 10000101, 'pw91', 'hash5'],
-        ['H', 'H', 10000102, 'pw91', 'hash6'],
-        ['H_pv', 'H', 10000101, 'pw91', 'hash7'],
-        ['H_pv', 'H', 10000102, 'pw91', 'hash8'],
-    ]
-    interactive_potcar_file.open("POTCAR")
-    path = pathlib.Path(interactive_potcar_file.filepath).absolute()
-    for args in potcar_args:
-        VaspPotcarFile(path, *args).store()
+    structure = structure_converter(minimal_pymatgen_supercell)
     # setup alternative (non-default) potcar parameters
     potcar_params = {'H': {}}
     if name is not None:
@@ -338,19 +292,10 @@ def test_from_structure_classmethod_single(name, interactive_potcar_file,
 
 
 # check linklist generation from multi-component structure
-@pytest.mark.parametrize('structure_type', ['pymatgen', 'aiida', 'poscar',
-                         'aiida_cusp_poscar'])
-def test_from_structure_classmethod_multi(with_pbe_potcars, structure_type,
+def test_from_structure_classmethod_multi(with_pbe_potcars,
+                                          structure_converter,
                                           multi_component_structure):
-    from aiida_cusp.data.inputs.vasp_poscar import VaspPoscarData
-    if structure_type == 'pymatgen':
-        structure = multi_component_structure
-    elif structure_type == 'aiida':
-        structure = StructureData(pymatgen_structure=multi_component_structure)
-    elif structure_type == 'poscar':
-        structure = Poscar(multi_component_structure)
-    elif structure_type == 'aiida_cusp_poscar':
-        structure = VaspPoscarData(structure=multi_component_structure)
+    structure = structure_converter(multi_component_structure)
     # generate potental map using the default potential settings (i.e.
     # name == element, version == latest)
     potential_map = VaspPotcarData.from_structure(structure, 'pbe')
@@ -363,12 +308,36 @@ def test_from_structure_classmethod_multi(with_pbe_potcars, structure_type,
         assert potential_map[element].functional == 'pbe'
 
 
+def test_site_symbols_from_structure(structure_converter,
+                                     multi_component_structure):
+    structure = structure_converter(multi_component_structure)
+    site_symbols = VaspPotcarData.site_symbols_from_structure(structure)
+    expected = [str(s) for s in multi_component_structure.species]
+    # the order of sites may change during conversion
+    assert sorted(site_symbols) == sorted(expected)
+
+
+def test_site_symbols_from_structure_oxidation_states(
+        structure_converter, multi_component_structure):
+    # only the element symbols are returned for decorated structures
+    decorated = multi_component_structure.copy()
+    decorated.add_oxidation_state_by_element({'Li': 1, 'S': -2, 'P': 5,
+                                              'Br': -1})
+    structure = structure_converter(decorated)
+    site_symbols = VaspPotcarData.site_symbols_from_structure(structure)
+    expected = [str(s) for s in multi_component_structure.species]
+    assert sorted(site_symbols) == sorted(expected)
+
+
+def test_site_symbols_from_structure_raises():
+    with pytest.raises(VaspPotcarDataError) as exception:
+        VaspPotcarData.site_symbols_from_structure("not a structure")
+    assert "Unsupported structure type" in str(exception.value)
+
+
 @pytest.mark.filterwarnings("ignore::UserWarning")
-def test_potcar_from_linklist(with_pbe_potcars, multi_component_structure):
-    from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarFile
-    from aiida_cusp.data.inputs.vasp_poscar import VaspPoscarData
-    poscar = VaspPoscarData(structure=multi_component_structure)
-    potmap = VaspPotcarData.from_structure(multi_component_structure, 'pbe')
+def test_potcar_from_linklist(multi_component_linklist):
+    poscar, potmap = multi_component_linklist
     complete_potcar = VaspPotcarData.potcar_from_linklist(poscar, potmap)
     # build the expected potcar
     potcar_contents = []
@@ -381,12 +350,9 @@ def test_potcar_from_linklist(with_pbe_potcars, multi_component_structure):
 
 @pytest.mark.parametrize('symbol', ['Li', 'S', 'P', 'Br'])
 @pytest.mark.filterwarnings("ignore::UserWarning")
-def test_potcar_from_linklist_raises_on_missing(symbol, with_pbe_potcars,
-                                                multi_component_structure):
-    from aiida_cusp.data.inputs.vasp_potcar import VaspPotcarData
-    from aiida_cusp.utils.exceptions import VaspPotcarDataError
-    poscar = VaspPoscarData(structure=multi_component_structure)
-    potmap = VaspPotcarData.from_structure(multi_component_structure, 'pbe')
+def test_potcar_from_linklist_raises_on_missing(symbol,
+                                                multi_component_linklist):
+    poscar, potmap = multi_component_linklist
     # pop an arbitrary potential from the map and check that the call to
     # potcar_from_linklist() fails for the given structure
     potmap.pop(symbol)
@@ -416,12 +382,19 @@ def test_potcar_from_linklist_raises_on_missing(symbol, with_pbe_potcars,
     ('Mg', 'Mg_pv.old'),
 ])
 def test_potcar_props_from_name_list(element, potential_name):
-    from aiida_cusp.data import VaspPotcarData
     potcar_name_list = [potential_name]
     potcar_props = VaspPotcarData.potcar_props_from_name_list(potcar_name_list)
     assert potcar_props[element]['name'] == potential_name
 
 
+def test_potcar_props_from_name_list_cached():
+    potcar_props = VaspPotcarData.potcar_props_from_name_list(['Li_sv', 'S'])
+    # modifying the returned properties must not alter the cached ones
+    potcar_props['Li'].update({'name': 'Li', 'version': 10000101})
+    potcar_props = VaspPotcarData.potcar_props_from_name_list(['Li_sv', 'S'])
+    assert potcar_props == {'Li': {'name': 'Li_sv'}, 'S': {'name': 'S'}}
+
+
 @pytest.mark.parametrize('inputlist,expected_error',
 [   # noqa: E128
     (['Aa', 'Li_sv', 'Rh_pv_new'], "Parsed element 'Aa' is not in the list"),
@@ -430,8 +403,6 @@ def test_potcar_props_from_name_list(element, potential_name):
     (['Li', 'Li_sv', 'Rh_pv_new'], "Multiple potential names given for "),
 ])
 def test_potcar_props_from_name_raises(inputlist, expected_error):
-    from aiida_cusp.data import VaspPotcarData
-    from aiida_cusp.utils.exceptions import VaspPotcarDataError
     with pytest.raises(VaspPotcarDataError) as exception:
         _ = VaspPotcarData.potcar_props_from_name_list(inputlist)
     assert expected_error in str(exception.value)
@@ -3,8 +3,6 @@
 
 import pytest
 
-import json
-
 
 def test_store_and_load(testdata):
     from aiida.orm import load_node
@@ -12,22 +10,31 @@ def test_store_and_load(testdata):
     outcar = testdata / 'OUTCAR'
     outcar_node = VaspOutcarData(file=outcar)
     uuid = outcar_node.store().uuid
-    # load contents from stored node and compare to original
-    loaded_content = load_node(uuid).get_content()
+    # load contents from stored node and compare to original chunk by chunk
+    chunk_size = 1 << 16
     with open(outcar, 'rb') as outcar_file:
-        original_content = outcar_file.read()
-    assert loaded_content == original_content
+        for chunk in load_node(uuid).iter_content(chunk_size=chunk_size):
+            assert chunk == outcar_file.read(len(chunk))
+        assert outcar_file.read() == b''
 
 
-def test_get_outcar_method(testdata):
-    from pymatgen.io.vasp.outputs import Outcar
+def test_get_outcar_method(testdata, pmg_outcar):
     from aiida_cusp.data.outputs.vasp_outcar import VaspOutcarData
     outcar = testdata / 'OUTCAR'
     outcar_node = VaspOutcarData(file=outcar)
     # create Outcar object from node and compare to the original
     # pymatgen class generated from the test file
     outcar_obj_node = outcar_node.get_outcar()
-    outcar_obj_pmg = Outcar(outcar)
-    node_contents = json.dumps(outcar_obj_node.as_dict(), sort_keys=True)
-    pmg_contents = json.dumps(outcar_obj_pmg.as_dict(), sort_keys=True)
-    assert node_contents == pmg_contents
+    assert outcar_obj_node.as_dict() == pmg_outcar.as_dict()
+
+
+def test_get_outcar_method_independent(testdata, pmg_outcar):
+    from aiida.orm import load_node
+    from aiida_cusp.data.outputs.vasp_outcar import VaspOutcarData
+    outcar = testdata / 'OUTCAR'
+    uuid = VaspOutcarData(file=outcar).store().uuid
+    # modifications of a returned instance must not affect later calls
+    outcar_obj_first = load_node(uuid).get_outcar()
+    outcar_obj_first.run_stats.clear()
+    outcar_obj_second = load_node(uuid).get_outcar()
+    assert outcar_obj_second.as_dict() == pmg_outcar.as_dict()
@@ -3,8 +3,6 @@
 
 import pytest
 
-import json
-
 
 def test_store_and_load_node(testdata):
     from aiida.orm import load_node
@@ -12,28 +10,38 @@ def test_store_and_load_node(testdata):
     vasprun_xml = testdata / 'vasprun.xml'
     vasprun_node = VaspVasprunData(file=vasprun_xml)
     uuid = vasprun_node.store().uuid
-    # load contents from stored node and compare to original
-    loaded_content = load_node(uuid).get_content()
+    # load contents from stored node and compare to original chunk by chunk
+    chunk_size = 1 << 16
     with open(vasprun_xml, 'rb') as vasprun:
-        original_content = vasprun.read()
-    assert loaded_content == original_content
+        for chunk in load_node(uuid).iter_content(chunk_size=chunk_size):
+            assert chunk == vasprun.read(len(chunk))
+        assert vasprun.read() == b''
 
 
 @pytest.mark.filterwarnings("ignore::UserWarning")
-def test_get_vasprun_method(testdata):
-    from pymatgen.io.vasp.outputs import Vasprun
+def test_get_vasprun_method(testdata, pmg_vasprun):
     from aiida_cusp.data.outputs.vasp_vasprun import VaspVasprunData
-    from aiida_cusp.utils.defaults import VasprunParsingDefaults
-    default_parsing_args = VasprunParsingDefaults.PARSER_ARGS
     vasprun_xml = testdata / 'vasprun.xml'
     vasprun_node = VaspVasprunData(file=vasprun_xml)
     # create vasprun object from node and compare to the original
     # pymatgen class generated from the test file
     vasprun_obj_node = vasprun_node.get_vasprun()
-    vasprun_obj_pmg = Vasprun(vasprun_xml, **default_parsing_args)
-    node_contents = json.dumps(vasprun_obj_node.as_dict(), sort_keys=True)
-    pmg_contents = json.dumps(vasprun_obj_pmg.as_dict(), sort_keys=True)
-    assert node_contents == pmg_contents
+    assert vasprun_obj_node.as_dict() == pmg_vasprun.as_dict()
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_get_vasprun_method_independent(testdata, pmg_vasprun):
+    from aiida.orm import load_node
+    from aiida_cusp.data.outputs.vasp_vasprun import VaspVasprunData
+    vasprun_xml = testdata / 'vasprun.xml'
+    uuid = VaspVasprunData(file=vasprun_xml).store().uuid
+    # modifications of a returned instance must not affect later calls
+    vasprun_obj_first = load_node(uuid).get_vasprun()
+    vasprun_obj_first.final_structure.remove_sites([0])
+    vasprun_obj_first.ionic_steps[-1]['e_fr_energy'] = 0.0
+    vasprun_obj_first.parameters['ENCUT'] = -1
+    vasprun_obj_second = load_node(uuid).get_vasprun()
+    assert vasprun_obj_second.as_dict() == pmg_vasprun.as_dict()
 
 
 def test_parser_settings_update(testdata):
@@ -6,7 +6,16 @@ Test module for the VaspFileParser default parser class
 """
 
 
+import os
 import pytest
+from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
+from aiida_cusp.utils.defaults import PluginDefaults
+
+
+def _fast_touch(path):
+    # create an empty file without the additional utime() call issued by
+    # pathlib.Path.touch()
+    os.close(os.open(str(path), os.O_WRONLY | os.O_CREAT, 0o600))
 
 
 @pytest.mark.parametrize('filename,expected_normalized',
@@ -14,14 +23,15 @@ import pytest
     ('vasprun.xml', 'vasprun_xml'),
     ('W92932.tmp', 'w92932_tmp'),
     ('CONTCAR', 'contcar'),
+    ('Some-File+1.TXT', 'some_file_1_txt'),
+    ('F\u00e4ll.txt', 'f_ll_txt'),
 ])
 @pytest.mark.parametrize('subfolder', ['sub', '05', ''])
-def test_normalize_filename(vasp_file_parser, filename, subfolder,
-                            expected_normalized):
-    import pathlib
+def test_normalize_filename(vasp_file_parser_static, filename, subfolder,
+                            expected_normalized, abs_cwd):
     # construct some arbitrary absolute path to the file
-    filepath = pathlib.Path().absolute() / subfolder / filename
-    normalized = vasp_file_parser.normalized_filename(filepath)
+    filepath = abs_cwd / subfolder / filename
+    normalized = vasp_file_parser_static.normalized_filename(filepath)
     assert normalized == expected_normalized
 
 
@@ -39,18 +49,26 @@ def test_normalize_filename(vasp_file_parser, filename, subfolder,
     ('a00/NebFile', 'nebfile'),
     ('a00a/NebFile', 'nebfile'),
 ])
-def test_generate_linkname_from_path(vasp_file_parser, filename,
-                                     expected_linkname):
-    import pathlib
+def test_generate_linkname_from_path(vasp_file_parser_static, filename,
+                                     expected_linkname, abs_cwd):
     # construct some arbitrary absolute path to the file
-    filepath = pathlib.Path().absolute() / filename
-    linkname = vasp_file_parser.linkname(filepath)
+    filepath = abs_cwd / filename
+    linkname = vasp_file_parser_static.linkname(filepath)
     assert linkname == expected_linkname
 
 
+def test_linkname_for_repeated_filenames(vasp_file_parser_static, abs_cwd):
+    # identical filenames located in different folders are linked under
+    # different names, independent of the order the files are processed
+    parser = vasp_file_parser_static
+    for _ in range(2):
+        assert parser.linkname(abs_cwd / '01' / 'OUTCAR') == 'node_01.outcar'
+        assert parser.linkname(abs_cwd / 'sub' / 'OUTCAR') == 'outcar'
+        assert parser.linkname(abs_cwd / '02' / 'OUTCAR') == 'node_02.outcar'
+
+
 # test build_parsing_list for both regular outputs and outputs
-# located in subfolders
-@pytest.mark.parametrize('subfolder', ['', 'has/sub/folder'])
+# located in subfolders (see `retrieved_files_tree()`)
 @pytest.mark.parametrize('name_or_wildcard,expected_list',
 [   # noqa: E128
     # parse_files unset: check for default settings
@@ -72,18 +90,9 @@ def test_generate_linkname_from_path(vasp_file_parser, filename,
     (['*'], ['INCAR', 'POSCAR', 'CONTCAR', 'vasprun.xml', 'OUTCAR',
      'W3287382.tmp']),
 ])
-def test_build_parsing_list(vasp_file_parser, name_or_wildcard, tmpdir,
-                            expected_list, subfolder):
-    import pathlib
-    # fictitious list of file retrieved from a calculation
-    filelist = ['INCAR', 'POSCAR', 'CONTCAR', 'vasprun.xml', 'OUTCAR',
-                'W3287382.tmp']
-    pathtmpdir = pathlib.Path(tmpdir).absolute()
-    filepaths = [pathtmpdir / subfolder / f for f in filelist]
-    for filepath in filepaths:
-        if not filepath.parent.exists():
-            filepath.parent.mkdir(parents=True)
-        filepath.touch()
+def test_build_parsing_list(vasp_file_parser, name_or_wildcard,
+                            expected_list, retrieved_files_tree):
+    pathtmpdir, subfolder, _ = retrieved_files_tree
     # point parser to the temporary directory and setup parse option to
     # parse only the given files
     vasp_file_parser.tmpfolder = str(pathtmpdir)
@@ -94,22 +103,68 @@ def test_build_parsing_list(vasp_file_parser, name_or_wildcard, tmpdir,
     _ = vasp_file_parser.verify_and_set_parser_settings()
     exit_code = vasp_file_parser.build_parsing_list()
     assert exit_code is None
-    assert len(set(vasp_file_parser.files_to_parse)) == \
-           len(vasp_file_parser.files_to_parse)
+    parselist = sorted(map(str, vasp_file_parser.files_to_parse))
+    assert len(set(parselist)) == len(parselist)
     # check generated list matches with expected parsing list
     expected_parselist = [pathtmpdir / subfolder / f for f in expected_list]
-    assert set(vasp_file_parser.files_to_parse) == set(expected_parselist)
+    assert parselist == sorted(map(str, expected_parselist))
+
+
+# path-qualified entries only match files at the given location relative
+# to the retrieved folder (i.e. for NEB calculations)
+@pytest.mark.parametrize('name_or_wildcard,expected_list',
+[   # noqa: E128
+    (['01/OUTCAR'], ['01/OUTCAR']),
+    (['0?/OUTCAR'], ['00/OUTCAR', '01/OUTCAR']),
+    (['01/*'], ['01/OUTCAR', '01/CONTCAR']),
+    (['01/OUTCAR', 'CONTCAR'], ['01/OUTCAR', 'CONTCAR', '00/CONTCAR',
+     '01/CONTCAR']),
+    (['1/OUTCAR'], []),
+    (['00/01/OUTCAR'], []),
+])
+def test_build_parsing_list_subfolder_paths(vasp_file_parser, tmp_path,
+                                            name_or_wildcard, expected_list):
+    for filepath in ['OUTCAR', 'CONTCAR', '00/OUTCAR', '00/CONTCAR',
+                     '01/OUTCAR', '01/CONTCAR']:
+        (tmp_path / filepath).parent.mkdir(parents=True, exist_ok=True)
+        _fast_touch(tmp_path / filepath)
+    vasp_file_parser.tmpfolder = str(tmp_path)
+    vasp_file_parser.settings['parse_files'] = name_or_wildcard
+    _ = vasp_file_parser.verify_and_set_parser_settings()
+    exit_code = vasp_file_parser.build_parsing_list()
+    assert exit_code is None
+    parselist = sorted(map(str, vasp_file_parser.files_to_parse))
+    assert parselist == sorted(str(tmp_path / f) for f in expected_list)
+
+
+@pytest.mark.parametrize('parsing_list,expected_list',
+[   # noqa: E128
+    (['INCAR', 'INCAR'], ['INCAR']),
+    (['vasprun.xml', '*.xml'], ['*.xml']),
+    (['W*', '*xml'], ['W*', '*xml']),
+    (['INCAR', '*', 'W*'], ['*']),
+    ([], []),
+    # entries containing a path are matched component-wise
+    (['01/OUTCAR', '*CAR'], ['*CAR']),
+    (['01/OUTCAR', '0*'], ['01/OUTCAR', '0*']),
+    (['01/OUTCAR', '0?/OUTCAR'], ['0?/OUTCAR']),
+    (['OUTCAR', '0?/OUTCAR'], ['OUTCAR', '0?/OUTCAR']),
+    (['00/01/OUTCAR', '01/*'], ['01/*']),
+    (['01/00/OUTCAR', '01/*'], ['01/00/OUTCAR', '01/*']),
+])
+def test_reduce_parsing_list(parsing_list, expected_list):
+    reduced = VaspFileParser._reduce_parsing_list(parsing_list)
+    assert reduced == expected_list
 
 
 @pytest.mark.parametrize('wildcard', ['POTCAR', 'POT*', '*CAR', '*', 'P*',
                          '*R'])
-def test_potcar_is_never_parsed(wildcard, vasp_file_parser, tmpdir):
-    import pathlib
+def test_potcar_is_never_parsed(wildcard, vasp_file_parser, tmp_path):
     # prepare the potcar file
-    temporary_folder = pathlib.Path(tmpdir).absolute()
+    temporary_folder = tmp_path
     potcar_file = temporary_folder / 'POTCAR'
-    potcar_file.touch()
-    assert potcar_file.exists() is True
+    _fast_touch(potcar_file)
+    assert os.path.exists(potcar_file) is True
     # try to parese it using the VaspFileParser
     vasp_file_parser.tmpfolder = str(temporary_folder)
     vasp_file_parser.settings['parse_files'] = [wildcard]
@@ -122,18 +177,17 @@ def test_potcar_is_never_parsed(wildcard, vasp_file_parser, tmpdir):
 @pytest.mark.parametrize('file_exists', [True, False])
 @pytest.mark.parametrize('fail_on_missing', [True, False])
 def test_empty_parsing_list_fails(vasp_file_parser, file_exists,
-                                  fail_on_missing, tmpdir):
-    import pathlib
+                                  fail_on_missing, tmp_path):
     # construct some arbitrary non-existent file
-    filepath = pathlib.Path(tmpdir) / 'some_arbitrary_filename.abcd'
+    filepath = tmp_path / 'some_arbitrary_filename.abcd'
     # assure that the chosen file is indeed not present during the test
-    if filepath.is_file():
+    if os.path.isfile(filepath):
         filepath.unlink()
     # create file and update the parser settings
     if file_exists:
-        filepath.touch()
-    assert filepath.is_file() is file_exists
-    vasp_file_parser.tmpfolder = str(pathlib.Path(tmpdir).absolute())
+        _fast_touch(filepath)
+    assert os.path.isfile(filepath) is file_exists
+    vasp_file_parser.tmpfolder = str(tmp_path)
     vasp_file_parser.settings['fail_on_missing_files'] = fail_on_missing
     # check exit code matches expected results
     _ = vasp_file_parser.verify_and_set_parser_settings()
@@ -161,11 +215,9 @@ def test_empty_parsing_list_fails(vasp_file_parser, file_exists,
     ('CHGCAR', 'chgcar', 'cusp.chgcar'),
     ('PROCAR', 'procar', 'cusp.generic'),
 ])
-def test_parsing_for_calcs(vasp_file_parser, tmpdir, outfile, poscar,
-                           base_linkname, entrypoint, neb_subfolder):
-    import pathlib
-    from aiida.plugins import DataFactory
-    from aiida_cusp.utils.defaults import PluginDefaults
+def test_parsing_for_calcs(vasp_file_parser, tmp_path, outfile,
+                           base_linkname, entrypoint, neb_subfolder,
+                           cached_data_factory, request):
     # update linkname if file is located in neb subfolder
     if neb_subfolder:
         linkname = "{}{}.{}".format(PluginDefaults.NEB_NODE_PREFIX,
@@ -177,20 +229,18 @@ def test_parsing_for_calcs(vasp_file_parser, tmpdir, outfile, poscar,
     full_linkname = "{}.{}".format(PluginDefaults.PARSER_OUTPUT_NAMESPACE,
                                    linkname)
     # load expected datatype for output node
-    ExpectedDatatype = DataFactory(entrypoint)
+    ExpectedDatatype = cached_data_factory(entrypoint)
     # setup the file
-    tmpdirpath = pathlib.Path(tmpdir).absolute()
-    filepath = tmpdirpath / neb_subfolder / outfile
-    if not filepath.parent.exists():
-        filepath.parent.mkdir(parents=True)
+    filepath = tmp_path / neb_subfolder / outfile
+    filepath.parent.mkdir(parents=True, exist_ok=True)
     if outfile != 'CONTCAR':
-        filepath.touch()
+        _fast_touch(filepath)
     else:  # can't cheat on the CONTCAR when parsing with pymatgen
-        poscar.write_file(filepath)
-    assert filepath.is_file() is True
+        request.getfixturevalue('poscar').write_file(filepath)
+    assert os.path.isfile(filepath) is True
     # run the parser on the current temporary directory
     vasp_file_parser.settings['parse_files'] = [outfile]
-    errno = vasp_file_parser.parse(retrieved_temporary_folder=str(tmpdirpath))
+    errno = vasp_file_parser.parse(retrieved_temporary_folder=str(tmp_path))
     assert errno is None
     assert full_linkname in vasp_file_parser.outputs
     ParsedDatatype = vasp_file_parser.outputs.get(full_linkname)
@@ -203,24 +253,12 @@ def test_parsing_for_calcs(vasp_file_parser, tmpdir, outfile, poscar,
     ({'fail_on_missing_files': True}, None),
     ({'unknown_option': None}, 301),
 ])
-def test_accepted_parser_settings(vasp_code, setting, expected_exit_code):
-    from aiida.plugins import CalculationFactory
-    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
-    # define code
-    vasp_code.set_attribute('input_plugin', 'cusp.vasp')
-    # setup calculator
-    inputs = {
-        'code': vasp_code,
-        'metadata': {
-            'options': {
-                'resources': {'num_machines': 1},
-                'parser_settings': setting,
-            }
-        },
-    }
-    VaspCalculation = CalculationFactory('cusp.vasp')
-    vasp_calc_node = VaspCalculation(inputs=inputs).node
-    # init custom options and instantiate the parser class
+def test_accepted_parser_settings(vasp_calc_inputs, vasp_calculation_class,
+                                  setting, expected_exit_code):
+    # setup calculator with the custom options and instantiate the parser
+    inputs = vasp_calc_inputs
+    inputs['metadata']['options']['parser_settings'] = setting
+    vasp_calc_node = vasp_calculation_class(inputs=inputs).node
     parser = VaspFileParser(vasp_calc_node)
     exit_code = parser.verify_and_set_parser_settings()
     if not exit_code:
@@ -232,31 +270,19 @@ def test_accepted_parser_settings(vasp_code, setting, expected_exit_code):
 
 @pytest.mark.parametrize('filepath', ['somefile', '00/somefile',
                          '45/somefile', '99/somefile'])
-def test_output_node_namespaces(vasp_code, filepath, tmpdir):
-    import pathlib
-    from aiida.plugins import CalculationFactory
-    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
-    from aiida_cusp.utils.defaults import PluginDefaults
+def test_output_node_namespaces(vasp_calc_inputs, vasp_calculation_class,
+                                filepath, tmp_path):
     # setup files in the temporary directory
-    fpath = pathlib.Path(tmpdir) / filepath
-    if not fpath.parent.exists():
-        fpath.parent.mkdir(parents=True)
-    fpath.touch()  # define code
-    vasp_code.set_attribute('input_plugin', 'cusp.vasp')
+    fpath = tmp_path / filepath
+    fpath.parent.mkdir(parents=True, exist_ok=True)
+    _fast_touch(fpath)
     # setup calculator and instantiate parser class
-    inputs = {
-        'code': vasp_code,
-        'metadata': {
-            'options': {
-                'resources': {'num_machines': 1},
-                'parser_settings': {'parse_files': ['somefile']},
-            },
-        },
-    }
-    VaspCalculation = CalculationFactory('cusp.vasp')
-    vasp_calc = VaspCalculation(inputs=inputs)
+    inputs = vasp_calc_inputs
+    parser_settings = {'parse_files': ['somefile']}
+    inputs['metadata']['options']['parser_settings'] = parser_settings
+    vasp_calc = vasp_calculation_class(inputs=inputs)
     parser = VaspFileParser(vasp_calc.node)
-    exit_code = parser.parse(retrieved_temporary_folder=tmpdir)
+    exit_code = parser.parse(retrieved_temporary_folder=str(tmp_path))
     assert exit_code is None
     # test outputs can actually be linked (this would fail if the namespace
     # is not available)
@@ -268,5 +294,4 @@ def test_list_of_essential_files():
     """
     Assert that the expected_files() method returns `None`
     """
-    from aiida_cusp.parsers.vasp_file_parser import VaspFileParser
     assert VaspFileParser.expected_files() is None
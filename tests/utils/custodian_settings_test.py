@@ -7,21 +7,29 @@ Test suite for Custodian and related settings utility
 
 
 import pytest
+import pathlib
 
-from aiida_cusp.utils.defaults import CustodianDefaults
+from aiida_cusp.utils.custodian import CustodianSettings
+from aiida_cusp.utils.defaults import CustodianDefaults, PluginDefaults
+from aiida_cusp.utils.exceptions import CustodianSettingsError
+
+
+# default vasp command and stdout / stderr file names
+_DEFAULT_STDIO = (None, PluginDefaults.STDOUT_FNAME,
+                  PluginDefaults.STDERR_FNAME)
+# default settings used for comparison (tests must not modify these)
+_VASP_JOB_DEFAULTS = {
+    False: dict(CustodianDefaults.VASP_JOB_SETTINGS),
+    True: dict(CustodianDefaults.VASP_NEB_JOB_SETTINGS),
+}
+_CUSTODIAN_DEFAULTS = dict(CustodianDefaults.CUSTODIAN_SETTINGS)
+_HANDLER_DEFAULTS = dict(CustodianDefaults.ERROR_HANDLER_SETTINGS)
 
 
 @pytest.mark.parametrize('is_neb', [True, False])
 def test_setup_vaspjob_settings_no_input(is_neb):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults, PluginDefaults
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
-    if is_neb:
-        defaults = dict(CustodianDefaults.VASP_NEB_JOB_SETTINGS)
-    else:
-        defaults = dict(CustodianDefaults.VASP_JOB_SETTINGS)
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
+    defaults = _VASP_JOB_DEFAULTS[is_neb]
     # instantiate custodian settings with default values for vasp_cmd, stdout
     # and stderr
     custodian_settings = CustodianSettings(vasp_cmd, stdout, stderr,
@@ -32,13 +40,8 @@ def test_setup_vaspjob_settings_no_input(is_neb):
 
 @pytest.mark.parametrize('is_neb', [True, False])
 def test_setup_vaspjob_settings_with_inputs(is_neb):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults
     val = 'updated_value'
-    if is_neb:
-        defaults = dict(CustodianDefaults.VASP_NEB_JOB_SETTINGS)
-    else:
-        defaults = dict(CustodianDefaults.VASP_JOB_SETTINGS)
+    defaults = _VASP_JOB_DEFAULTS[is_neb]
     updated = {key: val for key in defaults.keys()}
     settings = dict(updated)
     # pop non-optional parameters from settings
@@ -54,10 +57,8 @@ def test_setup_vaspjob_settings_with_inputs(is_neb):
 
 
 def test_setup_custodian_settings_no_inputs():
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults
     val = 'updated_value'
-    defaults = dict(CustodianDefaults.CUSTODIAN_SETTINGS)
+    defaults = _CUSTODIAN_DEFAULTS
     # instantiate custodian settings and test setup_vaspjob_settings method
     # with defined settings
     custodian_settings = CustodianSettings(val, val, val, settings={})
@@ -66,12 +67,10 @@ def test_setup_custodian_settings_no_inputs():
 
 
 def test_setup_custodian_settings_with_inputs():
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults
     val = 'updated_value'
     settings = {key: val for key in CustodianDefaults.MODIFIABLE_SETTINGS}
     # update default parameters with given value
-    expected_settings = dict(CustodianDefaults.CUSTODIAN_SETTINGS)
+    expected_settings = dict(_CUSTODIAN_DEFAULTS)
     expected_settings.update(settings)
     # instantiate custodian settings and test setup_custodian_settings method
     # with defined settings
@@ -90,33 +89,23 @@ def test_setup_custodian_settings_with_inputs():
     'terminate_on_nonzero_returncode',
 ])
 def test_protected_custodian_settings(protected_custodian_setting):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
     settings = {protected_custodian_setting: None}
-    with pytest.raises(CustodianSettingsError) as exception:
+    expected_error = r"cannot set value for protected custodian setting"
+    with pytest.raises(CustodianSettingsError, match=expected_error):
         _ = CustodianSettings("", "", "", settings=settings)
-    expected_error = "cannot set value for protected custodian setting"
-    assert expected_error in str(exception.value)
-
-
-@pytest.mark.parametrize('handler_type', ['list', 'tuple', 'dict'])
-def test_setup_custodian_handlers_from_valid_types(handler_type):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults, PluginDefaults
-    handlers_avail = dict(CustodianDefaults.ERROR_HANDLER_SETTINGS)
-    if handler_type == 'list':
-        handlers = list(handlers_avail.keys())
-    elif handler_type == 'tuple':
-        handlers = tuple(handlers_avail.keys())
-    elif handler_type == 'dict':
-        handlers = {h: {} for h in handlers_avail.keys()}
-    else:
-        raise
+
+
+@pytest.mark.parametrize('handlers',
+[   # noqa: E128
+    list(_HANDLER_DEFAULTS.keys()),
+    tuple(_HANDLER_DEFAULTS.keys()),
+    {h: {} for h in _HANDLER_DEFAULTS.keys()},
+], ids=['list', 'tuple', 'dict'])
+def test_setup_custodian_handlers_from_valid_types(handlers):
+    handlers_avail = _HANDLER_DEFAULTS
     # instantiate custodian settings and test setup_vaspjob_settings method
     # with defined settings
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
     custodian_settings = CustodianSettings(stdout, stderr, stdout)
     output_handlers = custodian_settings.setup_custodian_handlers(handlers)
     import_path = CustodianDefaults.HANDLER_IMPORT_PATH
@@ -130,26 +119,19 @@ def test_setup_custodian_handlers_from_valid_types(handler_type):
 # is a string)
 @pytest.mark.parametrize('handler', ["VaspErrorHandler"])
 def test_setup_custodian_handlers_raises_on_invalid_type(handler):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults, PluginDefaults
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
     # instantiate custodian settings and test setup_vaspjob_settings method
     # with defined settings
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
     custodian_settings = CustodianSettings(vasp_cmd, stderr, stdout)
     # test invalid handler type
-    with pytest.raises(CustodianSettingsError) as exception:
+    with pytest.raises(CustodianSettingsError,
+                       match=r"Invalid input type for 'handler'"):
         _ = custodian_settings.setup_custodian_handlers(handler)
-    assert "Invalid input type for 'handler'" in str(exception.value)
 
 
 @pytest.mark.parametrize('handler_name,handler_params',
                          CustodianDefaults.ERROR_HANDLER_SETTINGS.items())
 def test_setup_custodian_handlers_with_params(handler_name, handler_params):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults
     val = 'updated_val'
     custodian_settings = CustodianSettings(val, val, val)
     hdlr_param_updated = {p: val for p in dict(handler_params).keys()}
@@ -163,61 +145,39 @@ def test_setup_custodian_handlers_with_params(handler_name, handler_params):
 @pytest.mark.parametrize('handler_name',
                          CustodianDefaults.ERROR_HANDLER_SETTINGS.keys())
 def test_setup_custodian_handlers_raises_for_invalid_param(handler_name):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import CustodianDefaults, PluginDefaults
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
     custodian_settings = CustodianSettings(vasp_cmd, stdout, stderr)
     hdlr_input = {handler_name: {'this_is_an_invalid_handler_parameter': None}}
-    with pytest.raises(CustodianSettingsError) as exception:
+    with pytest.raises(CustodianSettingsError, match=r"Invalid parameter"):
         hdlr_output = custodian_settings.setup_custodian_handlers(hdlr_input)
-    assert "Invalid parameter" in str(exception.value)
-
-
-@pytest.mark.parametrize('handler_type', ['list', 'tuple', 'dict'])
-def test_custodian_settings_raises_on_unprocessed_handler(handler_type):
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import PluginDefaults
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
-    if handler_type == 'list':
-        handlers = ["ThisIsAnUnknownHandler"]
-    elif handler_type == 'tuple':
-        handlers = ("ThisIsAnUnknownHandler",)
-    elif handler_type == 'dict':
-        handlers = {"ThisIsAnUnknownHandler": {}}
-    else:
-        raise
+
+
+@pytest.mark.parametrize('handlers',
+[   # noqa: E128
+    ["ThisIsAnUnknownHandler"],
+    ("ThisIsAnUnknownHandler",),
+    {"ThisIsAnUnknownHandler": {}},
+], ids=['list', 'tuple', 'dict'])
+def test_custodian_settings_raises_on_unprocessed_handler(handlers):
     # instantiate custodian settings and test setup_vaspjob_settings method
     # with defined settings
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
-    with pytest.raises(CustodianSettingsError) as exception:
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
+    with pytest.raises(CustodianSettingsError,
+                       match=r"Unknown Error-Handler\(s\)"):
         _ = CustodianSettings(vasp_cmd, stdout, stderr, handlers=handlers)
-    assert "Unknown Error-Handler(s)" in str(exception.value)
 
 
 def test_custodian_settings_raises_on_unprocessed_settings():
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.defaults import PluginDefaults
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
     settings = {"this_is_and_unknown_settings_key": None}
     # instantiate custodian settings and test setup_vaspjob_settings method
     # with defined settings
-    vasp_cmd = None
-    stdout = PluginDefaults.STDOUT_FNAME
-    stderr = PluginDefaults.STDERR_FNAME
-    with pytest.raises(CustodianSettingsError) as exception:
+    vasp_cmd, stdout, stderr = _DEFAULT_STDIO
+    with pytest.raises(CustodianSettingsError,
+                       match=r"got an invalid custodian setting"):
         _ = CustodianSettings(vasp_cmd, stdout, stderr, settings=settings)
-    assert "got an invalid custodian setting" in str(exception.value)
 
 
 def test_write_custodian_spec_raises_on_wrong_filetype(tmpdir):
-    import pathlib
-    from aiida_cusp.utils.custodian import CustodianSettings
-    from aiida_cusp.utils.exceptions import CustodianSettingsError
     outfile = pathlib.Path(tmpdir) / 'custodian_spec_file.not_yaml_suffix'
     # setup custom inputs including handler: use default settings for
     # vasp, custodian and the chosen handler
@@ -228,45 +188,40 @@ def test_write_custodian_spec_raises_on_wrong_filetype(tmpdir):
     settings = {}  # use the default vasp / custodian settings
     cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr, is_neb=False,
                                        handlers=handlers, settings=settings)
-    with pytest.raises(CustodianSettingsError) as exception:
+    with pytest.raises(CustodianSettingsError, match=r"^Given path"):
         cstdn_settings.write_custodian_spec(outfile)
-    assert str(exception.value).startswith('Given path') is True
 
 
-def test_write_custodian_spec_yaml_format_with_handler_regular(tmpdir):
-    import pathlib
-    from aiida_cusp.utils.custodian import CustodianSettings
-    outfile = pathlib.Path(tmpdir) / 'custodian_spec_file.yaml'
-    # setup custom inputs including handler: use default settings for
-    # vasp, custodian and the chosen handler
-    vasp_cmd = ['mpirun', '-np', '4', '/path/to/vasp']
-    stdout = 'stdout.txt'
-    stderr = 'stderr.txt'
-    handlers = ['VaspErrorHandler']  # use default settings for handler
-    settings = {}  # use the default vasp / custodian settings
-    cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr, is_neb=False,
-                                       handlers=handlers, settings=settings)
-    assert outfile.is_file() is False  # check file is not already there
-    cstdn_settings.write_custodian_spec(outfile)
-    assert outfile.is_file() is True  # check file was written
-    expected_spec_file_content = "\n".join([
-        "custodian_params:",
-        "  checkpoint: false",
-        "  gzipped_output: false",
-        "  max_errors: 10",
-        "  max_errors_per_job: null",
-        "  monitor_freq: 30",
-        "  polling_time_step: 10",
-        "  scratch_dir: null",
-        "  skip_over_errors: false",
-        "  terminate_func: null",
-        "  terminate_on_nonzero_returncode: false",
+# expected contents of the custodian spec file written for the different
+# combinations of job types and handlers
+_SPEC_CUSTODIAN_PARAMS = [
+    "custodian_params:",
+    "  checkpoint: false",
+    "  gzipped_output: false",
+    "  max_errors: 10",
+    "  max_errors_per_job: null",
+    "  monitor_freq: 30",
+    "  polling_time_step: 10",
+    "  scratch_dir: null",
+    "  skip_over_errors: false",
+    "  terminate_func: null",
+    "  terminate_on_nonzero_returncode: false",
+]
+_SPEC_HANDLERS = {
+    (): [
+        "handlers: []",
+    ],
+    ('VaspErrorHandler',): [
         "handlers:",
         "- hdlr: custodian.vasp.handlers.VaspErrorHandler",
         "  params:",
         "    errors_subset_to_catch: null",
         "    natoms_large_cell: 100",
         "    output_filename: aiida.out",
+    ],
+}
+_SPEC_JOBS = {
+    False: [
         "jobs:",
         "- jb: custodian.vasp.jobs.VaspJob",
         "  params:",
@@ -286,43 +241,10 @@ def test_write_custodian_spec_yaml_format_with_handler_regular(tmpdir):
         "    settings_override: null",
         "    stderr_file: stderr.txt",
         "    suffix: ''",
-    ]) + "\n"
-    with open(outfile, 'r') as custodian_spec_file:
-        custodian_spec_file_content = custodian_spec_file.read()
-    assert custodian_spec_file_content == expected_spec_file_content
-
-
-def test_write_custodian_spec_yaml_format_without_handler_regular(tmpdir):
-    import pathlib
-    from aiida_cusp.utils.custodian import CustodianSettings
-    outfile = pathlib.Path(tmpdir) / 'custodian_spec_file.yaml'
-    # setup custom inputs including handler: use default settings for
-    # vasp, custodian and the chosen handler
-    vasp_cmd = ['mpirun', '-np', '4', '/path/to/vasp']
-    stdout = 'stdout.txt'
-    stderr = 'stderr.txt'
-    handlers = []  # use default settings for handler
-    settings = {}  # use the default vasp / custodian settings
-    cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr, is_neb=False,
-                                       handlers=handlers, settings=settings)
-    assert outfile.is_file() is False  # check file is not already there
-    cstdn_settings.write_custodian_spec(outfile)
-    assert outfile.is_file() is True  # check file was written
-    expected_spec_file_content = "\n".join([
-        "custodian_params:",
-        "  checkpoint: false",
-        "  gzipped_output: false",
-        "  max_errors: 10",
-        "  max_errors_per_job: null",
-        "  monitor_freq: 30",
-        "  polling_time_step: 10",
-        "  scratch_dir: null",
-        "  skip_over_errors: false",
-        "  terminate_func: null",
-        "  terminate_on_nonzero_returncode: false",
-        "handlers: []",
+    ],
+    True: [
         "jobs:",
-        "- jb: custodian.vasp.jobs.VaspJob",
+        "- jb: custodian.vasp.jobs.VaspNEBJob",
         "  params:",
         "    $vasp_cmd:",
         "    - mpirun",
@@ -333,127 +255,52 @@ def test_write_custodian_spec_yaml_format_without_handler_regular(tmpdir):
         "    auto_gamma: false",
         "    auto_npar: false",
         "    backup: true",
-        "    copy_magmom: false",
         "    final: true",
         "    gamma_vasp_cmd: null",
+        "    half_kpts: false",
         "    output_file: stdout.txt",
         "    settings_override: null",
         "    stderr_file: stderr.txt",
         "    suffix: ''",
-    ]) + "\n"
-    with open(outfile, 'r') as custodian_spec_file:
-        custodian_spec_file_content = custodian_spec_file.read()
-    assert custodian_spec_file_content == expected_spec_file_content
+    ],
+}
 
+# complete spec file contents for all combinations of job type and handlers
+_SPEC_FILE_CONTENTS = {
+    (is_neb, handlers): "\n".join(_SPEC_CUSTODIAN_PARAMS + hdlr + job) + "\n"
+    for (handlers, hdlr) in _SPEC_HANDLERS.items()
+    for (is_neb, job) in _SPEC_JOBS.items()
+}
 
-def test_write_custodian_spec_yaml_format_with_handler_neb(tmpdir):
-    import pathlib
-    from aiida_cusp.utils.custodian import CustodianSettings
-    outfile = pathlib.Path(tmpdir) / 'custodian_spec_file.yaml'
+
+@pytest.mark.parametrize('is_neb', [False, True])
+@pytest.mark.parametrize('handlers', [(), ('VaspErrorHandler',)])
+def test_custodian_spec_contents_yaml_format(is_neb, handlers):
     # setup custom inputs including handler: use default settings for
     # vasp, custodian and the chosen handler
     vasp_cmd = ['mpirun', '-np', '4', '/path/to/vasp']
     stdout = 'stdout.txt'
     stderr = 'stderr.txt'
-    handlers = ['VaspErrorHandler']  # use default settings for handler
     settings = {}  # use the default vasp / custodian settings
-    cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr, is_neb=True,
-                                       handlers=handlers, settings=settings)
-    assert outfile.is_file() is False  # check file is not already there
-    cstdn_settings.write_custodian_spec(outfile)
-    assert outfile.is_file() is True  # check file was written
-    expected_spec_file_content = "\n".join([
-        "custodian_params:",
-        "  checkpoint: false",
-        "  gzipped_output: false",
-        "  max_errors: 10",
-        "  max_errors_per_job: null",
-        "  monitor_freq: 30",
-        "  polling_time_step: 10",
-        "  scratch_dir: null",
-        "  skip_over_errors: false",
-        "  terminate_func: null",
-        "  terminate_on_nonzero_returncode: false",
-        "handlers:",
-        "- hdlr: custodian.vasp.handlers.VaspErrorHandler",
-        "  params:",
-        "    errors_subset_to_catch: null",
-        "    natoms_large_cell: 100",
-        "    output_filename: aiida.out",
-        "jobs:",
-        "- jb: custodian.vasp.jobs.VaspNEBJob",
-        "  params:",
-        "    $vasp_cmd:",
-        "    - mpirun",
-        "    - -np",
-        "    - '4'",
-        "    - /path/to/vasp",
-        "    auto_continue: false",
-        "    auto_gamma: false",
-        "    auto_npar: false",
-        "    backup: true",
-        "    final: true",
-        "    gamma_vasp_cmd: null",
-        "    half_kpts: false",
-        "    output_file: stdout.txt",
-        "    settings_override: null",
-        "    stderr_file: stderr.txt",
-        "    suffix: ''",
-    ]) + "\n"
-    with open(outfile, 'r') as custodian_spec_file:
-        custodian_spec_file_content = custodian_spec_file.read()
+    cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr,
+                                       is_neb=is_neb, handlers=list(handlers),
+                                       settings=settings)
+    expected_spec_file_content = _SPEC_FILE_CONTENTS[(is_neb, handlers)]
+    custodian_spec_file_content = cstdn_settings.custodian_spec_contents()
     assert custodian_spec_file_content == expected_spec_file_content
 
 
-def test_write_custodian_spec_yaml_format_without_handler_neb(tmpdir):
-    import pathlib
-    from aiida_cusp.utils.custodian import CustodianSettings
+@pytest.mark.parametrize('is_neb', [False, True])
+@pytest.mark.parametrize('handlers', [(), ('VaspErrorHandler',)])
+def test_write_custodian_spec(tmpdir, is_neb, handlers):
     outfile = pathlib.Path(tmpdir) / 'custodian_spec_file.yaml'
-    # setup custom inputs including handler: use default settings for
-    # vasp, custodian and the chosen handler
     vasp_cmd = ['mpirun', '-np', '4', '/path/to/vasp']
-    stdout = 'stdout.txt'
-    stderr = 'stderr.txt'
-    handlers = []  # use default settings for handler
-    settings = {}  # use the default vasp / custodian settings
-    cstdn_settings = CustodianSettings(vasp_cmd, stdout, stderr, is_neb=True,
-                                       handlers=handlers, settings=settings)
+    cstdn_settings = CustodianSettings(vasp_cmd, 'stdout.txt', 'stderr.txt',
+                                       is_neb=is_neb, handlers=list(handlers))
     assert outfile.is_file() is False  # check file is not already there
     cstdn_settings.write_custodian_spec(outfile)
     assert outfile.is_file() is True  # check file was written
-    expected_spec_file_content = "\n".join([
-        "custodian_params:",
-        "  checkpoint: false",
-        "  gzipped_output: false",
-        "  max_errors: 10",
-        "  max_errors_per_job: null",
-        "  monitor_freq: 30",
-        "  polling_time_step: 10",
-        "  scratch_dir: null",
-        "  skip_over_errors: false",
-        "  terminate_func: null",
-        "  terminate_on_nonzero_returncode: false",
-        "handlers: []",
-        "jobs:",
-        "- jb: custodian.vasp.jobs.VaspNEBJob",
-        "  params:",
-        "    $vasp_cmd:",
-        "    - mpirun",
-        "    - -np",
-        "    - '4'",
-        "    - /path/to/vasp",
-        "    auto_continue: false",
-        "    auto_gamma: false",
-        "    auto_npar: false",
-        "    backup: true",
-        "    final: true",
-        "    gamma_vasp_cmd: null",
-        "    half_kpts: false",
-        "    output_file: stdout.txt",
-        "    settings_override: null",
-        "    stderr_file: stderr.txt",
-        "    suffix: ''",
-    ]) + "\n"
     with open(outfile, 'r') as custodian_spec_file:
         custodian_spec_file_content = custodian_spec_file.read()
+    expected_spec_file_content = _SPEC_FILE_CONTENTS[(is_neb, handlers)]
     assert custodian_spec_file_content == expected_spec_file_content
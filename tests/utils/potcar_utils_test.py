@@ -18,9 +18,19 @@ from aiida_cusp.utils.potcar import PotcarPathParser
 from aiida_cusp.utils.defaults import VaspDefaults
 
 
-# ever growing list of sample cases testing the regular expression used
-# to remove certain chars from the contents. every case that lead to a bug
-# should be added here!
+# minimal potential contents (element Xy, created 01Jan1000) which can be
+# processed by the PotcarParser
+_POTCAR_XY_CONTENTS = "\n".join([
+    "functional Xy 01Jan1000",
+    "parameters from PSCTR are:",
+    "VRHFIN =Xy: s100p100d100",
+    "TITEL  = functional Xy 01Jan1000"
+    "END of PSCTR-controll parameters",
+])
+
+
+# ever growing list of sample cases testing the removal of certain chars
+# from the contents. every case that lead to a bug should be added here!
 @pytest.mark.parametrize('sample_input,expected_string',
 [   # noqa: E128
     ("^", ""),
@@ -34,15 +44,14 @@ from aiida_cusp.utils.defaults import VaspDefaults
     ("s^a^m^p^l^e", "sample"),
     ("sa^^m^^^p^le", "sample"),
 ])
-def test_remove_regex(sample_input, expected_string):
-    remove_regex = PotcarParser._RE_REMOVE_CHARS
-    cleared_string = remove_regex.sub(r"", sample_input)
+def test_remove_chars(sample_input, expected_string):
+    cleared_string = PotcarParser.reduce_contents(sample_input)
     assert cleared_string == expected_string
 
 
-# ever growing list of sample cases testing the regular expression used
-# to condense certain consecutive chars (i.e. whitespaces) in inputs. every
-# case that lead to a bug should be added here!
+# ever growing list of sample cases testing the condensation of certain
+# consecutive chars (i.e. whitespaces) in inputs. every case that lead to a
+# bug should be added here!
 @pytest.mark.parametrize('sample_input,expected_string',
 [   # noqa: E128
     # simple empty space
@@ -67,10 +76,14 @@ def test_remove_regex(sample_input, expected_string):
     ("s\t\ta\t\t\tm\tp\tl\t\t\t\te", "s a m p l e"),
     # mixed empty and tabspaces
     ("s\t \ta\t  \t\tm\tp\t  l \t \t\t \te", "s a m p l e"),
+    # whitespaces enclosing removed chars
+    ("s ^ a \t^\t m^ ^p", "s a m p"),
+    # other whitespace chars are not condensed
+    ("s\r\r\n\n\f\f\v\va", "s\r\r\n\n\f\f\v\va"),
+    ("s \r  \n\t\f \t a", "s \r \n \f a"),
 ])
-def test_reduced_regex(sample_input, expected_string):
-    remove_regex = PotcarParser._RE_CONDENSE_CHARS
-    reduced_string = remove_regex.sub(r" ", sample_input)
+def test_condense_chars(sample_input, expected_string):
+    reduced_string = PotcarParser.reduce_contents(sample_input)
     assert reduced_string == expected_string
 
 
@@ -184,6 +197,8 @@ def test_potcar_parser_class(interactive_potcar_file):
     interactive_potcar_file.write(potential_head)
     path_to_potcar = interactive_potcar_file.filepath
     parsed = PotcarParser(path_to_potcar, functional='functional', name='name')
+    header_match = PotcarParser._RE_HEADER.search(parsed.contents)
+    assert parsed.header == header_match.group(1)
     assert parsed.element == "Ee"
     assert parsed.version == 99990399
     assert parsed.functional == 'functional'
@@ -194,11 +209,7 @@ def test_apply_quirks(interactive_potcar_file):
     # construct potential with appropriate title line to trigger the
     # corresponindg quirk
     potential_contents = "\n".join([
-        "functional Xy 01Jan1000",
-        "parameters from PSCTR are:",
-        "VRHFIN =Xy: s100p100d100",
-        "TITEL  = functional Xy 01Jan1000"
-        "END of PSCTR-controll parameters",
+        _POTCAR_XY_CONTENTS,
         "numerical potential contents following the header",
     ])
     interactive_potcar_file.open("POTCAR")
@@ -222,13 +233,7 @@ def test_apply_quirks(interactive_potcar_file):
 
 # check that unparseable version, element or date raises and exception
 def test_unparseable_raises(interactive_potcar_file):
-    potential_contents = "\n".join([
-        "functional Xy 01Jan1000",
-        "parameters from PSCTR are:",
-        "VRHFIN =Xy: s100p100d100",
-        "TITEL  = functional Xy 01Jan1000"
-        "END of PSCTR-controll parameters",
-    ])
+    potential_contents = _POTCAR_XY_CONTENTS
     interactive_potcar_file.open("POTCAR")
     interactive_potcar_file.write(potential_contents)
     path_to_potcar = interactive_potcar_file.filepath
@@ -314,3 +319,32 @@ def test_potcar_path_parses_raises_on_wrong_functional(tmpdir):
     with pytest.raises(PotcarPathError) as exception:
         parsed = PotcarPathParser(filepath)
     assert "Unable to parse functional identifier" in str(exception.value)
+
+
+def test_potcar_hash_uses_reduced_contents(interactive_potcar_file):
+    potential_contents = _POTCAR_XY_CONTENTS
+    interactive_potcar_file.open("POTCAR_A")
+    interactive_potcar_file.write(potential_contents)
+    parsed_a = PotcarParser(interactive_potcar_file.filepath,
+                            functional='F', name='N')
+    # potentials only differing in whitespaces and '^' chars share the
+    # same hash, i.e. the hash cannot be calculated from the raw file
+    interactive_potcar_file.open("POTCAR_B")
+    interactive_potcar_file.write(potential_contents.replace(" ", "\t ^"))
+    parsed_b = PotcarParser(interactive_potcar_file.filepath,
+                            functional='F', name='N')
+    assert parsed_a.hash == parsed_b.hash
+
+
+def test_potcar_parser_title(interactive_potcar_file):
+    potential_contents = _POTCAR_XY_CONTENTS
+    interactive_potcar_file.open("POTCAR")
+    interactive_potcar_file.write(potential_contents)
+    path_to_potcar = interactive_potcar_file.filepath
+    parsed = PotcarParser(path_to_potcar, functional='F', name='N')
+    assert parsed.title == "functional Xy 01Jan1000"
+    # contents without any line break raise
+    parsed.contents = "functional Xy 01Jan1000"
+    with pytest.raises(PotcarParserError) as exception:
+        parsed.potential_title()
+    assert "Error parsing title line for file" in str(exception.value)
@@ -49,6 +49,21 @@ def test_get_content_method(tmpdir, decompress):
         assert contents[8:] == testcontent_compressed[8:]
 
 
+@pytest.mark.parametrize('decompress', [True, False])
+def test_iter_content_method(tmpdir, decompress):
+    from aiida_cusp.utils.single_archive_data import SingleArchiveData
+    testfile = pathlib.Path(tmpdir / 'testfile.txt')
+    testcontent = "Test file contents".encode()
+    with open(testfile, 'wb') as filehandle:
+        filehandle.write(testcontent)
+    single_archive = SingleArchiveData(file=testfile)
+    chunks = list(single_archive.iter_content(chunk_size=4,
+                                              decompress=decompress))
+    assert all(len(chunk) <= 4 for chunk in chunks)
+    contents = single_archive.get_content(decompress=decompress)
+    assert b"".join(chunks) == contents
+
+
 def test_get_repository_file_path(tmpdir):
     from aiida_cusp.utils.single_archive_data import SingleArchiveData
     testfile = pathlib.Path(tmpdir / 'testfile.txt')